@@ -1,45 +1,78 @@
 # 🔹 1. Standard Library
 import os
+import re
 import json
-from io import BytesIO
-from datetime import timedelta
+import time
+import hashlib
+import threading
+import tempfile
+from datetime import datetime, timedelta
+from dataclasses import dataclass
 
 # 🔹 2. Environment Variables
 from dotenv import load_dotenv
 load_dotenv()
 
 # 🔹 3. Flask Core and Extensions
-from flask import Flask, render_template, request, redirect, session, send_file
+from flask import Flask, render_template, request, redirect, session, send_file, jsonify, url_for, g
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
+from sqlalchemy.dialects import postgresql, sqlite
 from flask_wtf.csrf import CSRFProtect
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.security import generate_password_hash, check_password_hash
 
-# 🔹 4. PDF ReportLab Libraries
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
+# 🔹 4. PDF Rendering (ReportLab)
+# reports.py (and with it ReportLab) is imported inside the report functions on first
+# use, so worker boot doesn't pay for it
 
 
 # App configuration
-from config import PRICES, LABELS, UNITS, ALLOWED_ADMINS, ADMIN_PASSWORD, ZELLE_HANDLE
+import pins
+import db_profile
+import metrics
+from profiling import RequestProfiler
+from jobs import JobRunner, QueueFull
+from intake_journal import IntakeJournal
+from live_feed import RevisionBus, TooManySubscribers
+from config import PRICES, LABELS, UNITS, ALLOWED_ADMINS, ADMIN_PASSWORD, ADMIN_PASSWORD_HASH, ZELLE_HANDLE
 
 
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("DATABASE_URL")
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# WAL/busy-timeout pragmas and pool sizing for SQLite, pre-ping/recycle for Postgres
+app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', db_profile.engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
 app.secret_key = os.getenv("SECRET_KEY")
 if not app.secret_key:
     raise ValueError("SECRET_KEY environment variable is not set.")
 db = SQLAlchemy(app)
+with app.app_context():
+    db_profile.install(db.engine)
+    # Per-endpoint latency, SQL counts and render/PDF spans, served at /metrics
+    if os.getenv("METRICS_ENABLED", "1") != "0":
+        metrics.init_app(app, db.engine)
 csrf = CSRFProtect(app)
+# Rate-limit counters live in a SQLite file shared by all workers on this host, so limits
+# hold across workers (see ratelimit_storage.py); RATELIMIT_STORAGE_URI can point elsewhere
+import ratelimit_storage  # noqa: F401  registers the sqlite:// storage scheme
+app.config.setdefault('RATELIMIT_STORAGE_URI', os.getenv(
+    "RATELIMIT_STORAGE_URI", "sqlite:///" + os.path.join(app.instance_path, 'ratelimit.db')
+))
 limiter = Limiter(get_remote_address, app=app, default_limits=[])
 
-# Hash admin password once at startup — plain-text env var, no format change needed on Render
-_admin_password_hash = generate_password_hash(ADMIN_PASSWORD)
+_admin_password_hash = ADMIN_PASSWORD_HASH
+
+def admin_password_hash():
+    """Return the admin credential hash: ADMIN_PASSWORD_HASH as deployed, or ADMIN_PASSWORD
+    hashed on the first login (not at boot, so recycled workers start without a KDF run)."""
+    global _admin_password_hash
+    if _admin_password_hash is None:
+        _admin_password_hash = generate_password_hash(ADMIN_PASSWORD)
+    return _admin_password_hash
 
 app.permanent_session_lifetime = timedelta(minutes=30)
 
@@ -57,8 +90,38 @@ class Order(db.Model):
     status = db.Column(db.String(50), default='Pending')
     source = db.Column(db.String(20), default='regular')
     user = db.relationship('User', backref=db.backref('orders', lazy=True))
+    items = db.relationship('OrderItem', backref='order', lazy=True,
+                            cascade='all, delete-orphan', order_by='OrderItem.id')
     amount_paid = db.Column(db.Float, default=0.0)
     price_snapshot = db.Column(db.Text, nullable=True)  # JSON: prices at time of order
+    # orders_version at this order's last change; /api/orders?since= filters on it
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # Keyset pagination on the dashboard walks regular orders by id, optionally per status;
+    # the unique index is the ON CONFLICT target that keeps one order per customer and source.
+    # Existing databases get new indexes from migrations.py, not from create_all
+    __table_args__ = (
+        db.Index('ix_order_source_id', 'source', 'id'),
+        db.Index('ix_order_source_status_id', 'source', 'status', 'id'),
+        db.Index('uq_order_user_source', 'user_id', 'source', unique=True),
+        db.Index('ix_order_status', 'status'),
+        db.Index('ix_order_revision', 'revision'),
+    )
+
+class OrderItem(db.Model):
+    """One line of an order; items_ordered on Order stays as the display string."""
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False, index=True)
+    item_key = db.Column(db.String(50), nullable=False, index=True)
+    quantity = db.Column(db.Float, nullable=False)
+    unit_price = db.Column(db.Float, nullable=False)
+
+class OrderTombstone(db.Model):
+    """A deleted order id and the revision it was deleted at, for /api/orders?since= pollers."""
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, nullable=False)
+    revision = db.Column(db.Integer, nullable=False, index=True)
+    deleted_at = db.Column(db.Float, nullable=False, default=time.time, server_default='0')
 
 class ItemPrice(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -71,15 +134,270 @@ class Config(db.Model):
     value = db.Column(db.Float)
 
 
+def _get_version(key):
+    """Return the integer version counter stored under `key` in the Config table (0 if unset)."""
+    value = db.session.query(Config.value).filter_by(key=key).scalar()
+    return int(value or 0)
+
+def _bump_version(key):
+    """Increment a Config version counter as part of the caller's transaction; return the new value.
+
+    The UPDATE locks the counter row until commit, so writers bumping the same key
+    commit in version order.
+    """
+    value = db.session.execute(
+        db.update(Config).where(Config.key == key).values(value=Config.value + 1)
+        .returning(Config.value).execution_options(synchronize_session=False)
+    ).scalar()
+    if value is None:
+        db.session.add(Config(key=key, value=1.0))
+        value = 1.0
+    return int(value)
+
+# Tombstones older than this are pruned; pollers whose ?since= predates the pruned ones
+# get a full snapshot (or a reload on the live feed) instead of a diff
+TOMBSTONE_TTL = int(os.getenv("TOMBSTONE_TTL", 24 * 3600))
+
+def _touch_orders(*criteria):
+    """Stamp the orders matching `criteria` with the orders_version this transaction commits as.
+
+    The bump itself is deferred to _stamp_revision just before commit, so the counter
+    row is locked only for the commit rather than for the whole request.
+    """
+    db.session.info.setdefault('touched_orders', []).append(criteria)
+
+def _tombstone_orders(*criteria):
+    """Record the orders matching `criteria` as deleted at this transaction's revision; call before deleting.
+
+    Tombstones are written now with revision 0 (never a real revision) and stamped by _stamp_revision.
+    """
+    db.session.execute(db.insert(OrderTombstone).from_select(
+        ['order_id', 'revision', 'deleted_at'],
+        db.select(Order.id, db.literal(0), db.literal(time.time())).where(*criteria)
+    ))
+    db.session.info['tombstoned'] = True
+
+def tombstone_floor():
+    """Revision through which tombstones have been pruned; ?since= below it can't be diffed."""
+    return _get_version('tombstone_floor')
+
+def _prune_tombstones():
+    cutoff = time.time() - TOMBSTONE_TTL
+    pruned = db.session.execute(
+        db.delete(OrderTombstone).where(OrderTombstone.deleted_at < cutoff)
+        .returning(OrderTombstone.revision).execution_options(synchronize_session=False)
+    ).scalars().all()
+    if pruned:
+        # Only runs under the orders_version row lock, so this read-modify-write can't race
+        floor = Config.query.filter_by(key='tombstone_floor').first()
+        if floor is None:
+            db.session.add(Config(key='tombstone_floor', value=float(max(pruned))))
+        elif floor.value < max(pruned):
+            floor.value = float(max(pruned))
+
+@event.listens_for(db.session, 'before_commit')
+def _stamp_revision(session):
+    """Bump orders_version once for everything _touch_orders/_tombstone_orders recorded.
+
+    Revisions have to become visible in commit order for ?since= pollers, so writers
+    still queue on the counter row; running the bump as the last statement keeps that
+    queue to the commit itself.
+    """
+    touched = session.info.pop('touched_orders', [])
+    deleted = session.info.pop('tombstoned', False)
+    if not (touched or deleted):
+        return
+    session.flush()
+    revision = _bump_version('orders_version')
+    for criteria in touched:
+        session.execute(
+            db.update(Order).where(*criteria).values(revision=revision)
+            .execution_options(synchronize_session=False)
+        )
+    if deleted:
+        session.execute(
+            db.update(OrderTombstone).where(OrderTombstone.revision == 0).values(revision=revision)
+            .execution_options(synchronize_session=False)
+        )
+        _prune_tombstones()
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _forget_revision(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop('touched_orders', None)
+        session.info.pop('tombstoned', None)
+
+
+# Per-worker price cache. Every gunicorn worker holds its own copy, keyed on the
+# `prices_version` Config row; /update_prices bumps that version so each worker
+# reloads the ItemPrice rows on its next request. The version is read straight from
+# the Config table (one indexed scalar), not from the TTL'd settings cache: new orders
+# snapshot these prices, so a worker must never keep charging stale ones.
+_price_cache = {'version': None, 'prices': None}
+_price_cache_stats = {'hits': 0, 'misses': 0}
+_price_cache_lock = threading.Lock()
+
+def invalidate_price_cache():
+    """Drop this worker's cached prices (other workers follow the DB version)."""
+    with _price_cache_lock:
+        _price_cache['version'] = None
+        _price_cache['prices'] = None
+
 def get_current_prices():
     """Return prices from DB, falling back to config.py defaults for any missing keys."""
+    version = _get_version('prices_version')
+    with _price_cache_lock:
+        if _price_cache['version'] == version:
+            _price_cache_stats['hits'] += 1
+            return dict(_price_cache['prices'])
+
     db_prices = {p.key: p.price for p in ItemPrice.query.all()}
-    return {key: db_prices.get(key, PRICES[key]) for key in PRICES}
+    prices = {key: db_prices.get(key, PRICES[key]) for key in PRICES}
+    with _price_cache_lock:
+        _price_cache['version'] = version
+        _price_cache['prices'] = prices
+        _price_cache_stats['misses'] += 1
+    return dict(prices)
+
+@dataclass(frozen=True)
+class Settings:
+    """Typed view of the Config key/value rows (defaults apply when a key has no row)."""
+    orders_open: bool = True
+    shared_cost: float = 0.0
+
+    @classmethod
+    def from_rows(cls, rows):
+        values = {row.key: row.value for row in rows}
+        return cls(
+            orders_open=values.get('orders_open', 1.0) == 1.0,
+            shared_cost=values.get('shared_cost') or 0.0,
+        )
+
+
+# Per-worker settings cache. The worker that changes a setting invalidates its own
+# copy immediately; other workers pick it up within SETTINGS_TTL_SECONDS.
+SETTINGS_TTL_SECONDS = float(os.getenv("SETTINGS_TTL_SECONDS", 5))
+_settings_cache = {'settings': None, 'loaded_at': 0.0}
+_settings_lock = threading.Lock()
+
+def invalidate_settings():
+    """Force the next get_settings() call in this worker to reload from the DB."""
+    with _settings_lock:
+        _settings_cache['settings'] = None
+
+def get_settings():
+    """Return all Config keys as a Settings object, loaded in a single query and cached."""
+    now = time.monotonic()
+    with _settings_lock:
+        cached = _settings_cache['settings']
+        if cached is not None and now - _settings_cache['loaded_at'] < SETTINGS_TTL_SECONDS:
+            return cached
+
+    settings = Settings.from_rows(Config.query.all())
+    with _settings_lock:
+        _settings_cache['settings'] = settings
+        _settings_cache['loaded_at'] = now
+    return settings
 
 def is_orders_open():
     """Return True if the order form is open (default: open if no record exists)."""
-    cfg = Config.query.filter_by(key='orders_open').first()
-    return cfg is None or cfg.value == 1.0
+    return get_settings().orders_open
+
+def get_order_totals(source='regular'):
+    """Return (count, sum of totals, sum of amount_paid) for a source in one aggregate query."""
+    count, total, paid = db.session.query(
+        func.count(Order.id),
+        func.coalesce(func.sum(Order.total_price_usd), 0.0),
+        func.coalesce(func.sum(Order.amount_paid), 0.0),
+    ).filter(Order.source == source).one()
+    return count, total, paid
+
+
+# Item demand is cached per worker against `orders_version`, which every route that
+# changes an order bumps, so repeated downloads on pickup day skip the aggregate.
+_demand_cache = {'version': None, 'demand': None}
+_demand_lock = threading.Lock()
+
+def get_item_demand():
+    """Return total quantity, unit and subtotal per item for the current regular orders."""
+    version = _get_version('orders_version')
+    with _demand_lock:
+        if _demand_cache['version'] == version:
+            return _demand_cache['demand']
+
+    rows = db.session.query(
+        OrderItem.item_key,
+        func.sum(OrderItem.quantity),
+        func.sum(OrderItem.quantity * OrderItem.unit_price),
+    ).join(Order).filter(Order.source == 'regular').group_by(OrderItem.item_key).all()
+    totals = {key: (qty, subtotal) for key, qty, subtotal in rows}
+    items = [
+        {
+            'key': key,
+            'label': LABELS[key],
+            'unit': UNITS.get(key, 'each'),
+            'quantity': totals[key][0],
+            # Weighted by each order's snapshot price, so it can differ from today's price
+            'unit_price': round(totals[key][1] / totals[key][0], 2) if totals[key][0] else 0.0,
+            'subtotal': round(totals[key][1], 2),
+        }
+        for key in PRICES if key in totals
+    ]
+    demand = {
+        'generated': datetime.now().strftime("%Y-%m-%d %H:%M"),
+        'orders_version': version,
+        'num_orders': get_order_totals()[0],
+        'grand_total': round(sum(item['subtotal'] for item in items), 2),
+        'items': items,
+    }
+    with _demand_lock:
+        _demand_cache.update(version=version, demand=demand)
+    return demand
+
+def build_report_snapshot():
+    """Read regular orders, customers, line items and settings once into plain, picklable data.
+
+    This is what generate_reports.py hands to its render processes; see reports.py for the
+    order tuple layout.
+    """
+    from reports import short_items
+    settings = get_settings()
+    lines = {}
+    line_rows = (
+        db.session.query(OrderItem.order_id, OrderItem.item_key, OrderItem.quantity)
+        .join(Order).filter(Order.source == 'regular')
+        .order_by(OrderItem.order_id, OrderItem.id)
+    )
+    for order_id, key, qty in line_rows:
+        lines.setdefault(order_id, []).append((key, qty))
+
+    order_rows = (
+        db.session.query(Order.id, User.zelle_name, User.phone, Order.total_price_usd,
+                         Order.amount_paid, Order.status)
+        .join(Order.user).filter(Order.source == 'regular')
+        .order_by(Order.id)
+    )
+    orders = []
+    for rank, (order_id, name, phone, total, paid, status) in enumerate(order_rows, start=1):
+        if len(phone) == 10 and phone.isdigit():
+            phone = f"{phone[:3]}-{phone[3:6]}-{phone[6:]}"
+        items = short_items(lines.get(order_id, []), LABELS, UNITS)
+        orders.append((rank, order_id, name, phone, items, total, paid or 0.0, status or 'Pending'))
+
+    return {
+        'generated': datetime.now().strftime("%Y-%m-%d %H:%M"),
+        'orders_open': settings.orders_open,
+        'shared_cost': settings.shared_cost,
+        'orders': orders,
+        'demand': get_item_demand(),
+    }
+
+def reset_caches():
+    """Drop every per-worker cache (prices, settings, item demand)."""
+    invalidate_price_cache()
+    invalidate_settings()
+    with _demand_lock:
+        _demand_cache.update(version=None, demand=None)
 
 
 # Main Landing Page
@@ -88,6 +406,39 @@ def index():
     current_prices = get_current_prices()
     return render_template('index.html', prices=current_prices, labels=LABELS, units=UNITS, orders_open=is_orders_open())
 
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", 50))
+BALANCE_FILTERS = ('paid', 'unpaid', 'overpaid')
+STATUS_FILTERS = ('Pending', 'Confirmed')
+
+def _dashboard_filters():
+    """Return the recognised dashboard filters from the query string (unknown values dropped)."""
+    filters = {}
+    if request.args.get('status') in STATUS_FILTERS:
+        filters['status'] = request.args['status']
+    if request.args.get('balance') in BALANCE_FILTERS:
+        filters['balance'] = request.args['balance']
+    if request.args.get('item') in PRICES:
+        filters['item'] = request.args['item']
+    return filters
+
+def _filtered_orders(filters, shared_per_order):
+    """Build the regular-order query for the dashboard table with filters applied in SQL."""
+    query = Order.query.options(joinedload(Order.user)).filter(Order.source == 'regular')
+    if 'status' in filters:
+        query = query.filter(Order.status == filters['status'])
+    if 'balance' in filters:
+        # Same "remaining due" the template shows, with a half-cent tolerance
+        remaining = Order.total_price_usd + shared_per_order - func.coalesce(Order.amount_paid, 0.0)
+        if filters['balance'] == 'unpaid':
+            query = query.filter(remaining > 0.005)
+        elif filters['balance'] == 'overpaid':
+            query = query.filter(remaining < -0.005)
+        else:
+            query = query.filter(remaining.between(-0.005, 0.005))
+    if 'item' in filters:
+        query = query.filter(Order.items.any(OrderItem.item_key == filters['item']))
+    return query
+
 # Dashboard Route
 @app.route('/dashboard', methods=['GET', 'POST'])
 def dashboard():
@@ -103,41 +454,325 @@ def dashboard():
         else:
             config.value = shared_cost
         db.session.commit()
+        invalidate_settings()
         return redirect('/dashboard')
 
-    orders = Order.query.filter_by(source="regular").all()
-    shared_cost_cfg = Config.query.filter_by(key='shared_cost').first()
-    shared_cost = shared_cost_cfg.value if shared_cost_cfg else 0
-    num_orders = len(orders)
+    settings = get_settings()
+    shared_cost = settings.shared_cost
+    # Header totals always cover the whole window, not just the filtered page
+    num_orders, _, total_received = get_order_totals()
     shared_per_order = (shared_cost / num_orders) if num_orders else 0
-    total_received = sum(order.amount_paid or 0.0 for order in orders)
+
+    is_admin = session.get('admin', False)
+    # Admin pages open the live feed from this revision. Read it before the rows, as
+    # api_orders does: a change committed in between is then newer than the page's
+    # since=, so the feed still sends it instead of leaving the page silently stale
+    revision = _get_version('orders_version') if is_admin else None
+
+    filters = _dashboard_filters()
+    query = _filtered_orders(filters, shared_per_order)
+    matching_orders = query.count()
+    after = request.args.get('after', type=int)
+    before = request.args.get('before', type=int)
+    if before is not None:
+        page = query.filter(Order.id < before).order_by(Order.id.desc()).limit(DASHBOARD_PAGE_SIZE + 1).all()
+        has_prev = len(page) > DASHBOARD_PAGE_SIZE
+        orders = list(reversed(page[:DASHBOARD_PAGE_SIZE]))
+        has_next = True
+    else:
+        if after is not None:
+            query = query.filter(Order.id > after)
+        page = query.order_by(Order.id).limit(DASHBOARD_PAGE_SIZE + 1).all()
+        has_next = len(page) > DASHBOARD_PAGE_SIZE
+        orders = page[:DASHBOARD_PAGE_SIZE]
+        has_prev = after is not None
+    prev_url = url_for('dashboard', before=orders[0].id, **filters) if orders and has_prev else None
+    next_url = url_for('dashboard', after=orders[-1].id, **filters) if orders and has_next else None
+
     current_prices = get_current_prices()
     return render_template(
         'dashboard.html',
         orders=orders,
+        return_to=request.full_path,
+        revision=revision,
+        filters=filters,
+        matching_orders=matching_orders,
+        prev_url=prev_url,
+        next_url=next_url,
         shared_per_order=shared_per_order,
         shared_cost=shared_cost,
-        is_admin=session.get('admin', False),
+        is_admin=is_admin,
         total_received=total_received,
         current_prices=current_prices,
         labels=LABELS,
         units=UNITS,
-        orders_open=is_orders_open()
+        orders_open=settings.orders_open
+    )
+
+# Live dashboard feed: one revision-polling thread per worker fans changes out to
+# connected admins over SSE (see live_feed.py). Each open stream holds a worker thread,
+# so clients per worker are capped and streams end after SSE_STREAM_SECONDS (browsers reconnect)
+SSE_MAX_CLIENTS = int(os.getenv("SSE_MAX_CLIENTS", 4))
+SSE_POLL_SECONDS = float(os.getenv("SSE_POLL_SECONDS", 1.0))
+app.config.setdefault('SSE_STREAM_SECONDS', int(os.getenv("SSE_STREAM_SECONDS", 300)))
+SSE_CHANGE_LIMIT = 200  # past this many changed rows, clients reload instead of patching
+
+def _orders_revision():
+    with app.app_context():
+        return _get_version('orders_version')
+
+def _order_changes(since):
+    """Ids of regular orders changed and deleted after revision `since`, plus the header total."""
+    with app.app_context():
+        revision = _get_version('orders_version')
+        changed = list(db.session.execute(
+            db.select(Order.id).where(Order.source == 'regular', Order.revision > since)
+            .order_by(Order.id).limit(SSE_CHANGE_LIMIT + 1)
+        ).scalars())
+        deleted = list(db.session.execute(
+            db.select(OrderTombstone.order_id).where(OrderTombstone.revision > since)
+            .order_by(OrderTombstone.order_id).limit(SSE_CHANGE_LIMIT + 1)
+        ).scalars())
+        num_orders, _, total_received = get_order_totals()
+        shared_cost = get_settings().shared_cost
+        pruned = since < tombstone_floor()
+    reload = pruned or len(changed) > SSE_CHANGE_LIMIT or len(deleted) > SSE_CHANGE_LIMIT
+    return {
+        'revision': revision,
+        'changed': [] if reload else changed,
+        'deleted': [] if reload else deleted,
+        'total_received': total_received,
+        # Every row's shared-cost and remaining-due cells depend on this
+        'shared_per_order': round(shared_cost / num_orders, 2) if num_orders else 0,
+        'reload': reload,
+    }
+
+live_feed = RevisionBus(_orders_revision, _order_changes,
+                        interval=SSE_POLL_SECONDS, max_subscribers=SSE_MAX_CLIENTS)
+
+# Admin live feed of order changes (Server-Sent Events); the page patches rows in place
+@app.route('/dashboard/events')
+def dashboard_events():
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    since = request.headers.get('Last-Event-ID') or request.args.get('since', '')
+    since = int(since) if since.isdigit() else None
+    try:
+        subscription = live_feed.subscribe(since)
+    except TooManySubscribers:
+        response = app.response_class("Live feed is full on this worker; retrying shortly.", status=503)
+        response.headers['Retry-After'] = '30'
+        return response
+    deadline = time.monotonic() + app.config['SSE_STREAM_SECONDS']
+    # Per-order shared cost the page was rendered with; when it moves, every row is stale
+    shared = request.args.get('shared', type=float)
+
+    def stream():
+        nonlocal shared
+        sent = since if since is not None else -1
+        yield "retry: 5000\n\n"
+        while (remaining := deadline - time.monotonic()) > 0:
+            change = subscription.get(timeout=min(15.0, remaining))
+            if subscription.overflowed:
+                yield "event: reload\ndata: {}\n\n"
+                return
+            if change is None:
+                yield ": keepalive\n\n"  # also how a closed connection gets noticed
+            elif change['revision'] > sent:
+                sent = change['revision']
+                event = 'reload' if change['reload'] else 'orders'
+                if shared is not None and abs(change['shared_per_order'] - shared) >= 0.005:
+                    shared = change['shared_per_order']
+                    event = 'reload'
+                    change = dict(change, message='Shared cost per order changed.')
+                yield f"id: {sent}\nevent: {event}\ndata: {json.dumps(change)}\n\n"
+
+    response = app.response_class(stream(), mimetype='text/event-stream')
+    response.call_on_close(lambda: live_feed.unsubscribe(subscription))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+# Admin single dashboard row, fetched by the live feed to patch the page
+@app.route('/dashboard/row/<int:order_id>')
+def dashboard_row(order_id):
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    num_orders, _, _ = get_order_totals()
+    shared_per_order = (get_settings().shared_cost / num_orders) if num_orders else 0
+    # The page's filters come along in the query string; a row that no longer matches is a 404
+    order = (
+        _filtered_orders(_dashboard_filters(), shared_per_order)
+        .filter(Order.id == order_id).first_or_404()
     )
+    return render_template('_order_row.html', order=order, shared_per_order=shared_per_order,
+                           is_admin=True, return_to=_next_url())
+
+def _order_json(row, is_admin):
+    """API view of an order row, masked for non-admins the same way dashboard.html masks it."""
+    return {
+        'id': row.id,
+        'name': row.zelle_name if is_admin else '****',
+        'phone': row.phone if is_admin else '******' + row.phone[-4:],
+        'items_ordered': row.items_ordered,
+        'total_price_usd': row.total_price_usd,
+        'amount_paid': row.amount_paid or 0.0,
+        'status': row.status or 'Pending',
+        'revision': row.revision,
+    }
+
+# Orders as JSON for dashboard polling: ?since=<revision> returns only what changed
+# (plus ids deleted since then), and an unchanged poll is answered with 304
+@app.route('/api/orders')
+def api_orders():
+    since = request.args.get('since')
+    if since is not None:
+        if not since.isdigit():
+            return "since must be a revision number.", 400
+        since = int(since)
+        if since < tombstone_floor():
+            since = None  # deletions since then were pruned: answer with a full snapshot
+    is_admin = bool(session.get('admin'))
+    settings = get_settings()
+    # Read the revision before the rows: anything committed in between is newer than
+    # `revision`, so the client's next poll picks it up again rather than missing it
+    revision = _get_version('orders_version')
+    etag = (f"orders-{revision}-{'all' if since is None else since}"
+            f"-{settings.shared_cost:.2f}-{'admin' if is_admin else 'public'}")
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        num_orders, _, _ = get_order_totals()
+        rows = (
+            db.session.query(Order.id, User.zelle_name, User.phone, Order.items_ordered,
+                             Order.total_price_usd, Order.amount_paid, Order.status, Order.revision)
+            .join(Order.user).filter(Order.source == 'regular')
+        )
+        deleted = []
+        if since is not None:
+            rows = rows.filter(Order.revision > since)
+            deleted = list(db.session.execute(
+                db.select(OrderTombstone.order_id).where(OrderTombstone.revision > since)
+                .order_by(OrderTombstone.order_id)
+            ).scalars())
+        response = jsonify(
+            revision=revision,
+            since=since,
+            shared_per_order=(settings.shared_cost / num_orders) if num_orders else 0,
+            orders=[_order_json(row, is_admin) for row in rows.order_by(Order.id)],
+            deleted=deleted,
+        )
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Cookie')
+    return response
 
 def _get_phone_or_ip():
     """Rate-limit key for submit_order: use phone so masjid shared IPs aren't blocked."""
     return request.form.get('phone') or get_remote_address()
 
+def _insert(model):
+    """Return an INSERT for `model` with the bound dialect's ON CONFLICT support."""
+    dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+    return dialect.insert(model)
+
+def _upsert_user(zelle_name, phone, pin_hash):
+    """Create the customer unless the phone exists, filling in a missing PIN hash.
+
+    Returns (user_id, stored pin_hash). If a concurrent submit inserted the phone
+    first, this reads the winner's row instead of failing on the unique key.
+    """
+    user_id = db.session.execute(
+        _insert(User)
+        .values(zelle_name=zelle_name, phone=phone, pin_hash=pin_hash)
+        .on_conflict_do_nothing(index_elements=['phone'])
+        .returning(User.id)
+    ).scalar()
+    if user_id is not None:
+        return user_id, pin_hash
+    if pin_hash is not None:
+        db.session.execute(
+            db.update(User)
+            .where(User.phone == phone, User.pin_hash.is_(None))
+            .values(pin_hash=pin_hash)
+            .execution_options(synchronize_session=False)
+        )
+    row = db.session.execute(db.select(User.id, User.pin_hash).where(User.phone == phone)).one()
+    return row.id, row.pin_hash
+
+def _upsert_regular_order(user_id, items_str, total, snapshot, line_items):
+    """Insert or replace the customer's regular order and its line items; return the order id."""
+    stmt = _insert(Order).values(
+        user_id=user_id, source='regular', status='Pending', amount_paid=0.0,
+        items_ordered=items_str, total_price_usd=total, price_snapshot=snapshot,
+    )
+    order_id = db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=['user_id', 'source'],
+            set_={
+                'items_ordered': stmt.excluded.items_ordered,
+                'total_price_usd': stmt.excluded.total_price_usd,
+                'price_snapshot': stmt.excluded.price_snapshot,
+            },
+        ).returning(Order.id)
+    ).scalar_one()
+    db.session.execute(db.delete(OrderItem).where(OrderItem.order_id == order_id))
+    if line_items:
+        db.session.execute(db.insert(OrderItem), [dict(line, order_id=order_id) for line in line_items])
+    return order_id
+
+def _apply_intake_batch(entries):
+    """Write journaled submissions to the database in one transaction; return {entry_id: error}."""
+    errors = {}
+    with app.app_context():
+        order_ids = []
+        for entry_id, sub in entries:
+            # Each entry gets a savepoint, so one that can't be applied is rejected on its
+            # own instead of failing (and endlessly retrying) the whole batch
+            try:
+                with db.session.begin_nested():
+                    user_id, pin_hash = _upsert_user(sub['zelle_name'], sub['phone'], sub['new_pin_hash'])
+                    if pin_hash != sub['pin_hash']:
+                        errors[entry_id] = "PIN changed before this submission was applied"
+                        continue
+                    order_ids.append(_upsert_regular_order(user_id, sub['items_ordered'], sub['total'],
+                                                           sub['price_snapshot'], sub['line_items']))
+            except (SQLAlchemyError, KeyError, TypeError) as exc:
+                errors[entry_id] = f"could not be applied: {exc}"
+        if order_ids:
+            _touch_orders(Order.id.in_(order_ids))
+        db.session.commit()
+    return errors
+
+# INTAKE_MODE=journal confirms submissions from a local group-committed journal and
+# applies them to the database in batches (see intake_journal.py); "direct" commits per request
+app.config.setdefault('INTAKE_MODE', os.getenv("INTAKE_MODE", "direct"))
+INTAKE_BATCH_SIZE = int(os.getenv("INTAKE_BATCH_SIZE", 200))
+intake_journal = IntakeJournal(
+    os.getenv("INTAKE_JOURNAL_PATH") or os.path.join(app.instance_path, 'intake_journal.db'),
+    _apply_intake_batch, batch_size=INTAKE_BATCH_SIZE,
+)
+
+def _pin_matches(phone, pin, pin_hash):
+    """Check a PIN, accepting a fresh verified-customer token from this session before the KDF."""
+    return (pins.token_verifies(app.secret_key, session.get('pin_token'), phone, pin, pin_hash)
+            or pins.check_pin(pin_hash, pin))
+
 @app.route('/submit_order', methods=['POST'])
 @limiter.limit("5 per minute", key_func=_get_phone_or_ip)
 def submit_order():
+    # Served from the settings cache, so a closed form rejects posts without a DB hit
     if not is_orders_open():
         return "Orders are currently closed. No new orders are being accepted.", 403
-    zelle_name = request.form.get('zelle_name')
-    phone = request.form.get('phone')
+    zelle_name = request.form.get('zelle_name', '').strip()
+    phone = request.form.get('phone', '')
     pin = request.form.get('pin', '').strip()
 
+    # Both intake modes validate everything before writing or journaling: a journaled
+    # entry that can't be applied would otherwise be acknowledged and then lost
+    if not zelle_name:
+        return "Zelle name is required.", 400
+
     if not phone.isdigit() or len(phone) != 10:
         return "Phone number must be exactly 10 digits.", 400
 
@@ -146,6 +781,7 @@ def submit_order():
 
     current_prices = get_current_prices()
     items_ordered = []
+    line_items = []
     total = 0.0
 
     for key, price in current_prices.items():
@@ -159,39 +795,59 @@ def submit_order():
                     total += quantity * price
                     qty_str = int(quantity) if quantity.is_integer() else quantity
                     items_ordered.append(f"{label}: {qty_str} {unit}")
+                    line_items.append({'item_key': key, 'quantity': quantity, 'unit_price': price})
             except (ValueError, ZeroDivisionError):
                 continue
 
     items_str = ', '.join(items_ordered) if items_ordered else "No items"
     snapshot = json.dumps(current_prices)
 
-    user = User.query.filter_by(phone=phone).first()
-    if not user:
-        user = User(zelle_name=zelle_name, phone=phone, pin_hash=generate_password_hash(pin))
-        db.session.add(user)
-        db.session.commit()
-    else:
-        if user.pin_hash is None:
-            user.pin_hash = generate_password_hash(pin)
-            db.session.commit()
-        elif not check_password_hash(user.pin_hash, pin):
-            return "Incorrect PIN. Please try again.", 403
-
-    existing_order = Order.query.filter_by(user_id=user.id).first()
-    if existing_order:
-        existing_order.items_ordered = items_str
-        existing_order.total_price_usd = total
-        existing_order.price_snapshot = snapshot
-    else:
-        new_order = Order(
-            user_id=user.id,
+    # Hash or verify the PIN before writing anything, so no row locks are held during the KDF
+    journal = app.config['INTAKE_MODE'] == 'journal'
+    known_hash = db.session.execute(db.select(User.pin_hash).where(User.phone == phone)).scalar()
+    if journal:
+        # A journaled submission not yet applied may have set this customer's PIN
+        known_hash = intake_journal.pending_pin_hash(phone) or known_hash
+    with metrics.span('pin'):
+        if known_hash is None:
+            verified_hash = new_hash = pins.hash_pin(pin)
+        elif _pin_matches(phone, pin, known_hash):
+            verified_hash, new_hash = known_hash, None
+        else:
+            verified_hash = None
+    if verified_hash is None:
+        return "Incorrect PIN. Please try again.", 403
+
+    if journal:
+        reference = intake_journal.append(phone, {
+            'zelle_name': zelle_name, 'phone': phone,
+            'pin_hash': verified_hash, 'new_pin_hash': new_hash,
+            'items_ordered': items_str, 'total': total,
+            'price_snapshot': snapshot, 'line_items': line_items,
+        })
+        session['pin_token'] = pins.issue_token(app.secret_key, phone, pin, verified_hash)
+        return render_template(
+            'confirmation.html',
+            zelle_name=zelle_name,
+            phone=phone,
             items_ordered=items_str,
-            total_price_usd=total,
-            price_snapshot=snapshot
+            total=total,
+            zelle_handle=ZELLE_HANDLE,
+            reference=reference
         )
-        db.session.add(new_order)
 
-    db.session.commit()
+    # User, order and line items are written in one transaction with ON CONFLICT upserts,
+    # so a double-tapped submit can neither create a second order nor fail on a unique key
+    user_id, pin_hash = _upsert_user(zelle_name, phone, new_hash)
+    if pin_hash != verified_hash and not _pin_matches(phone, pin, pin_hash):
+        # A concurrent submit for this phone set a different PIN first
+        db.session.rollback()
+        return "Incorrect PIN. Please try again.", 403
+    order_id = _upsert_regular_order(user_id, items_str, total, snapshot, line_items)
+    _touch_orders(Order.id == order_id)
+    with metrics.span('commit'):
+        db.session.commit()
+    session['pin_token'] = pins.issue_token(app.secret_key, phone, pin, pin_hash)
     return render_template(
         'confirmation.html',
         zelle_name=zelle_name,
@@ -211,13 +867,20 @@ def admin_login():
     if request.method == 'POST':
         phone = request.form.get('phone')
         password = request.form.get('password')
-        if phone in ALLOWED_ADMINS and check_password_hash(_admin_password_hash, password):
+        if phone in ALLOWED_ADMINS and check_password_hash(admin_password_hash(), password):
             session['admin'] = True
             return redirect('/dashboard')
         else:
             return "Access denied", 403
     return render_template('admin_login.html')
 
+def _next_url():
+    """Return the local ?next= URL to go back to after an admin action (default /dashboard)."""
+    next_url = request.args.get('next', '/dashboard')
+    if not next_url.startswith('/') or next_url.startswith('//'):
+        next_url = '/dashboard'
+    return next_url
+
 # Admin confirming order
 @app.route('/confirm_order/<int:order_id>', methods=['POST'])
 def confirm_order(order_id):
@@ -225,11 +888,9 @@ def confirm_order(order_id):
         return "Unauthorized", 403
     order = db.get_or_404(Order, order_id)
     order.status = 'Confirmed'
+    _touch_orders(Order.id == order.id)
     db.session.commit()
-    next_url = request.args.get('next', '/dashboard')
-    if not next_url.startswith('/') or next_url.startswith('//'):
-        next_url = '/dashboard'
-    return redirect(next_url)
+    return redirect(_next_url())
 
 # Admin logout
 @app.route('/logout')
@@ -249,6 +910,7 @@ def toggle_orders():
     else:
         cfg.value = 0.0 if cfg.value == 1.0 else 1.0
     db.session.commit()
+    invalidate_settings()
     return redirect('/dashboard')
 
 # Admin clearing all orders
@@ -256,6 +918,18 @@ def toggle_orders():
 def clear_orders():
     if not session.get('admin'):
         return "Unauthorized", 403
+    if app.config['INTAKE_MODE'] == 'journal':
+        # Journaled submissions must be in the database before the clear, or they'd reappear
+        # after it; if another worker is still applying them, refuse rather than race it
+        intake_journal.apply_pending()
+        if intake_journal.stats()['pending']:
+            response = app.response_class(
+                "Submitted orders are still being saved. Try again in a few seconds.", status=409)
+            response.headers['Retry-After'] = '5'
+            return response
+    _tombstone_orders(Order.source == "regular")
+    regular_ids = db.select(Order.id).where(Order.source == "regular")
+    OrderItem.query.filter(OrderItem.order_id.in_(regular_ids)).delete(synchronize_session=False)
     Order.query.filter_by(source="regular").delete()
     db.session.commit()
     return redirect('/dashboard')
@@ -276,12 +950,15 @@ def edit_order(order_id):
 
     if request.method == 'POST':
         quantities = {}
+        line_items = []
         total_price = 0.0
         for key in PRICES:
             qty = float(request.form.get(key, 0) or 0)
             if qty > 0:
+                unit_price = snapshot_prices.get(key, PRICES[key])
                 quantities[key] = qty
-                total_price += qty * snapshot_prices.get(key, PRICES[key])
+                total_price += qty * unit_price
+                line_items.append(OrderItem(item_key=key, quantity=qty, unit_price=unit_price))
 
         items_ordered = ', '.join([
             f"{LABELS[key]}: {int(quantities[key])} {UNITS.get(key, 'each')}"
@@ -289,21 +966,14 @@ def edit_order(order_id):
         ])
         order.items_ordered = items_ordered
         order.total_price_usd = total_price
+        order.items = line_items
+        _touch_orders(Order.id == order.id)
         db.session.commit()
         return redirect('/dashboard')
 
-    # Parse current quantities from stored string
-    quantities = {}
-    for key in PRICES:
-        label = LABELS[key]
-        if label in order.items_ordered:
-            try:
-                part = order.items_ordered.split(label + ":")[1].split(",")[0].strip().split()[0]
-                quantities[key] = int(float(part))
-            except (ValueError, IndexError):
-                quantities[key] = 0
-        else:
-            quantities[key] = 0
+    quantities = {key: 0 for key in PRICES}
+    for item in order.items:
+        quantities[item.item_key] = int(item.quantity)
 
     return render_template(
         "edit_order.html",
@@ -331,58 +1001,273 @@ def update_prices():
                     db.session.add(ItemPrice(key=key, price=price))
             except ValueError:
                 continue
+    _bump_version('prices_version')
     db.session.commit()
+    invalidate_settings()
+    invalidate_price_cache()
     return redirect('/dashboard')
 
+# Admin view of per-worker cache counters
+@app.route('/cache_stats')
+def cache_stats():
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    with _price_cache_lock:
+        prices = dict(_price_cache_stats, version=_price_cache['version'])
+    with _settings_lock:
+        settings_age = time.monotonic() - _settings_cache['loaded_at'] if _settings_cache['settings'] else None
+    intake = intake_journal.stats() if app.config['INTAKE_MODE'] == 'journal' else None
+    return jsonify(pid=os.getpid(), prices=prices, settings_age_seconds=settings_age, intake=intake)
+
+# Admin view of request latency, SQL and span metrics (Prometheus text format)
+@app.route('/metrics')
+def metrics_endpoint():
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Opt-in cProfile capture: admins add ?_profile=1 (or an X-Profile: 1 header) to any request;
+# PROFILE_SAMPLE_EVERY=N also profiles every Nth request a worker handles
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 50))
+PROFILE_SAMPLE_EVERY = int(os.getenv("PROFILE_SAMPLE_EVERY", 0))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(app.instance_path, 'profiles'))
+profiler = RequestProfiler(PROFILE_DIR, keep=PROFILE_KEEP, sample_every=PROFILE_SAMPLE_EVERY)
+
+@app.before_request
+def start_profile():
+    flagged = request.args.get('_profile') == '1' or request.headers.get('X-Profile') == '1'
+    if flagged and session.get('admin'):
+        g.profile, g.profile_reason = profiler.start(), 'requested'
+    elif profiler.should_sample():
+        g.profile, g.profile_reason = profiler.start(), 'sampled'
+
+@app.after_request
+def finish_profile(response):
+    started = g.pop('profile', None)
+    if started is not None:
+        response.headers['X-Profile-Id'] = profiler.finish(
+            started, endpoint=request.endpoint, method=request.method, path=request.full_path.rstrip('?'),
+            status=response.status_code, reason=g.pop('profile_reason'),
+        )
+    return response
+
+@app.teardown_request
+def discard_profile(exc):
+    # A request that errored before after_request ran must still give up the profiler
+    started = g.pop('profile', None)
+    if started is not None:
+        profiler.discard(started)
+
+# Admin list of recent request profiles with their top functions by cumulative time
+@app.route('/admin/profiles')
+def admin_profiles():
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    return render_template('profiles.html', profiles=profiler.recent(),
+                           sample_every=PROFILE_SAMPLE_EVERY, keep=PROFILE_KEEP)
+
+# Admin download of one raw profile (for pstats/snakeviz)
+@app.route('/admin/profiles/<name>.prof')
+def admin_profile_download(name):
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    path = profiler.path(name)
+    if path is None:
+        return "Profile not found", 404
+    return send_file(path, as_attachment=True, download_name=f"{name}.prof",
+                     mimetype='application/octet-stream')
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 500))
+app.config.setdefault('REPORT_CACHE_DIR', os.getenv(
+    "REPORT_CACHE_DIR", os.path.join(app.instance_path, 'report_cache')
+))
+
+def _render_confirmed_orders(output):
+    from reports import render_confirmed_orders_pdf
+    # Stream rows in batches (a server-side cursor on Postgres) so worker memory stays
+    # flat no matter how many orders are confirmed
+    rows = (
+        db.session.query(User.zelle_name, User.phone, Order.items_ordered,
+                         Order.total_price_usd, Order.amount_paid)
+        .join(Order.user)
+        .filter(Order.status == 'Confirmed', Order.source == 'regular')
+        .order_by(Order.id)
+        .yield_per(EXPORT_BATCH_SIZE)
+    )
+    render_confirmed_orders_pdf(rows, output)
+
+def _render_item_demand(output):
+    from reports import render_item_demand_pdf
+    render_item_demand_pdf(get_item_demand(), output)
+
+# Report type -> (download name, renderer writing the PDF to a binary file)
+REPORTS = {
+    'confirmed_orders': ('confirmed_orders.pdf', _render_confirmed_orders),
+    'item_demand': ('Item_Demand_Breakdown.pdf', _render_item_demand),
+}
+
+def report_etag(report_type):
+    """Content address of a report: the current orders version plus a hash of it and the report type.
+
+    The version prefix lets cache pruning tell older files from newer ones.
+    """
+    version = _get_version('orders_version')
+    return f"{version}-" + hashlib.sha256(f"{report_type}:{version}".encode()).hexdigest()
+
+def _report_file(report_type, etag):
+    return os.path.join(app.config['REPORT_CACHE_DIR'], f"{report_type}-{etag}.pdf")
+
+def _report_file_version(report_type, filename):
+    """orders_version of a cached report file name, or None if it isn't one for `report_type`."""
+    prefix = report_type + '-'
+    if not filename.startswith(prefix) or not filename.endswith('.pdf'):
+        return None
+    version = filename[len(prefix):].split('-', 1)[0]
+    return int(version) if version.isdigit() else None
+
+def cached_report_path(report_type, etag):
+    """Return the on-disk PDF for (report_type, etag), rendering it first on a cache miss.
+
+    Files are written to a temp name and renamed into place, so concurrent workers never
+    serve a partial PDF. Afterwards only versions older than this one are removed, so a
+    slow render of an old version can't delete a newer file. Only report jobs call this;
+    requests send a file that already exists (see _send_report).
+    """
+    cache_dir = app.config['REPORT_CACHE_DIR']
+    path = _report_file(report_type, etag)
+    written = _report_file_version(report_type, os.path.basename(path))
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as spool, metrics.span(f'pdf:{report_type}'):
+            REPORTS[report_type][1](spool)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    for name in os.listdir(cache_dir):
+        version = _report_file_version(report_type, name)
+        if version is not None and written is not None and version < written:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+    return path
+
+def _send_report(report_type):
+    """Serve a cached report with a strong ETag, answering If-None-Match with 304.
+
+    Only a PDF already on disk is sent inline. A miss is rendered as a background job,
+    the same as POST /jobs: 202 with the job's URLs, or 503 when the job pool is full,
+    so direct hits on these URLs can't tie up request threads with renders.
+    """
+    etag = report_etag(report_type)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        try:
+            report = open(_report_file(report_type, etag), 'rb')
+        except FileNotFoundError:
+            return _submit_report_job(report_type, etag)
+        response = send_file(report, as_attachment=True, download_name=REPORTS[report_type][0],
+                             mimetype='application/pdf', conditional=False, etag=False)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 # Admin export confirmed orders as PDF
 @app.route('/export_confirmed_pdf')
 def export_confirmed_pdf():
     if not session.get('admin'):
         return "Unauthorized", 403
+    return _send_report('confirmed_orders')
 
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    elements = []
-    styles = getSampleStyleSheet()
-
-    elements.append(Paragraph("Confirmed Orders Summary", styles['Title']))
-    elements.append(Spacer(1, 12))
-
-    confirmed_orders = Order.query.filter_by(status='Confirmed', source='regular').all()
-
-    data = [["Name", "Phone", "Items Ordered", "Total", "Amt Paid", "Remaining"]]
-
-    for order in confirmed_orders:
-        formatted_items = Paragraph(order.items_ordered.replace(", ", "<br/>"), styles['Normal'])
-        amount_paid = order.amount_paid or 0.0
-        remaining = order.total_price_usd - amount_paid
-        data.append([
-            order.user.zelle_name,
-            order.user.phone,
-            formatted_items,
-            f"${order.total_price_usd:.2f}",
-            f"${amount_paid:.2f}",
-            f"${remaining:.2f}",
-        ])
+# Admin item demand breakdown for the current window (PDF for print, JSON for the farm's sheet)
+@app.route('/reports/item_demand.pdf')
+def item_demand_pdf():
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    return _send_report('item_demand')
+
+@app.route('/reports/item_demand.json')
+def item_demand_json():
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    return jsonify(get_item_demand())
 
-    table = Table(data, colWidths=[90, 80, 130, 60, 60, 58])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#f0f0f0")),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
-
-    elements.append(table)
-    doc.build(elements)
-    buffer.seek(0)
-
-    return send_file(buffer, as_attachment=True, download_name="confirmed_orders.pdf", mimetype='application/pdf')
+# Background report jobs: rendering happens on a capped per-worker thread pool, so a slow
+# export never ties up a request worker that is also taking customer submissions
+REPORT_JOB_WORKERS = int(os.getenv("REPORT_JOB_WORKERS", 1))
+REPORT_JOB_QUEUE = int(os.getenv("REPORT_JOB_QUEUE", 4))
+report_jobs = JobRunner(os.path.join(app.instance_path, 'report_jobs'),
+                        max_workers=REPORT_JOB_WORKERS, max_pending=REPORT_JOB_QUEUE)
+
+def _run_report_job(report_type, etag):
+    with app.app_context():
+        cached_report_path(report_type, etag)
+    return {'report': report_type, 'etag': etag}
+
+def _submit_report_job(report_type, etag):
+    """Queue a render of (report_type, etag): 202 with the job's URLs, or 503 when the pool is full."""
+    try:
+        job_id = report_jobs.submit(report_type, _run_report_job, report_type, etag,
+                                    key=(report_type, etag))
+    except QueueFull:
+        return jsonify(error="Too many reports are being generated. Try again shortly."), 503, {'Retry-After': '5'}
+    return jsonify(_job_json(report_jobs.get(job_id))), 202
+
+def _job_json(job):
+    data = {key: job[key] for key in ('id', 'status', 'kind', 'error') if key in job}
+    data['status_url'] = url_for('report_job_status', job_id=job['id'])
+    if job['status'] == 'done':
+        data['download_url'] = url_for('report_job_download', job_id=job['id'])
+    return data
+
+@app.route('/jobs', methods=['POST'])
+def start_report_job():
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    report_type = request.form.get('report')
+    if report_type not in REPORTS:
+        return "Unknown report", 400
+    etag = report_etag(report_type)
+    if os.path.exists(_report_file(report_type, etag)):
+        job_id = report_jobs.record(report_type, {'report': report_type, 'etag': etag})
+        return jsonify(_job_json(report_jobs.get(job_id))), 202
+    return _submit_report_job(report_type, etag)
+
+@app.route('/jobs/<job_id>')
+def report_job_status(job_id):
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify(error="Unknown job"), 404
+    return jsonify(_job_json(job))
+
+@app.route('/jobs/<job_id>/download')
+def report_job_download(job_id):
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    job = report_jobs.get(job_id)
+    if job is None:
+        return "Unknown job", 404
+    if job['status'] != 'done':
+        return f"Report is {job['status']}", 409
+    report_type, etag = job['result']['report'], job['result']['etag']
+    try:
+        # Opened, not just checked, so pruning after this point can't fail the download
+        report = open(_report_file(report_type, etag), 'rb')
+    except FileNotFoundError:
+        # Only versions older than a newer render are pruned, so the orders really changed
+        return "Orders changed since this report was generated. Please export again.", 410
+    response = send_file(report, as_attachment=True, download_name=REPORTS[report_type][0],
+                         mimetype='application/pdf', etag=False)
+    response.set_etag(etag)
+    return response
 
 # Admin delete order
 @app.route('/delete_order/<int:order_id>', methods=['POST'])
@@ -390,12 +1275,10 @@ def delete_order(order_id):
     if not session.get('admin'):
         return "Unauthorized", 403
     order = db.get_or_404(Order, order_id)
+    _tombstone_orders(Order.id == order.id)
     db.session.delete(order)
     db.session.commit()
-    next_url = request.args.get('next', '/dashboard')
-    if not next_url.startswith('/') or next_url.startswith('//'):
-        next_url = '/dashboard'
-    return redirect(next_url)
+    return redirect(_next_url())
 
 # Admin update payment
 @app.route('/update_payment/<int:order_id>', methods=['POST'])
@@ -406,11 +1289,138 @@ def update_payment(order_id):
     new_amount = request.form.get('amount_paid')
     try:
         order.amount_paid = float(new_amount)
+        _touch_orders(Order.id == order.id)
         db.session.commit()
     except (ValueError, TypeError):
         pass
     return redirect('/dashboard')
 
+# Admin bulk confirm or delete of the orders ticked on the dashboard
+@app.route('/bulk/orders', methods=['POST'])
+def bulk_orders():
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    action = request.form.get('action')
+    if action not in ('confirm', 'delete'):
+        return "Unknown bulk action.", 400
+    ids = sorted({int(v) for v in request.form.getlist('order_ids') if v.isdigit()})
+    rows = (
+        db.session.query(Order.id, User.zelle_name, User.phone, Order.status)
+        .join(Order.user).filter(Order.id.in_(ids)).order_by(Order.id).all()
+    )
+
+    if action == 'confirm':
+        # One UPDATE for the whole selection; RETURNING tells us which rows actually changed
+        changed_ids = set(db.session.execute(
+            db.update(Order)
+            .where(Order.id.in_(ids), Order.status != 'Confirmed')
+            .values(status='Confirmed')
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
+        if changed_ids:
+            _touch_orders(Order.id.in_(changed_ids))
+        after = 'Confirmed'
+    else:
+        changed_ids = {row.id for row in rows}
+        if changed_ids:
+            _tombstone_orders(Order.id.in_(changed_ids))
+        OrderItem.query.filter(OrderItem.order_id.in_(changed_ids)).delete(synchronize_session=False)
+        Order.query.filter(Order.id.in_(changed_ids)).delete(synchronize_session=False)
+        after = 'Deleted'
+    db.session.commit()
+
+    found = {row.id for row in rows}
+    return render_template(
+        'bulk_result.html',
+        title='Confirm orders' if action == 'confirm' else 'Delete orders',
+        changes=[(row.id, row.zelle_name, row.phone, row.status or 'Pending', after)
+                 for row in rows if row.id in changed_ids],
+        unchanged=[(row.id, row.zelle_name, row.phone, row.status) for row in rows if row.id not in changed_ids],
+        errors=[f"Order #{order_id} not found" for order_id in ids if order_id not in found],
+        next_url=_next_url(),
+    )
+
+_PAYMENT_LINE = re.compile(r'^\s*(.+?)[\s,;]+\$?([\d.,]+)\s*$')
+
+def _parse_payment_grid(text):
+    """Parse pasted "order id or phone, amount" lines.
+
+    Returns ({('id', order_id) or ('phone', phone): (amount, line_no)}, [error messages]).
+    A 10-digit identifier (punctuation ignored) is a phone; otherwise an order id like 42 or #42.
+    """
+    payments, errors = {}, []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        match = _PAYMENT_LINE.match(line)
+        try:
+            amount = float(match.group(2).replace(',', '')) if match else None
+        except ValueError:
+            amount = None
+        if amount is None:
+            errors.append(f"Line {line_no}: expected \"order id or phone, amount\" but got {line.strip()!r}")
+            continue
+        ident = match.group(1).strip()
+        digits = re.sub(r'\D', '', ident)
+        if len(digits) == 10:
+            key = ('phone', digits)
+        elif ident.lstrip('#').isdigit():
+            key = ('id', int(ident.lstrip('#')))
+        else:
+            errors.append(f"Line {line_no}: {ident!r} is neither an order id nor a 10-digit phone")
+            continue
+        if key in payments:
+            errors.append(f"Line {line_no}: {ident} was already listed on line {payments[key][1]}")
+            continue
+        payments[key] = (amount, line_no)
+    return payments, errors
+
+# Admin bulk payment entry from a pasted grid (e.g. a Zelle statement export)
+@app.route('/bulk/payments', methods=['POST'])
+def bulk_payments():
+    if not session.get('admin'):
+        return "Unauthorized", 403
+    payments, errors = _parse_payment_grid(request.form.get('payments', ''))
+    ids = [value for kind, value in payments if kind == 'id']
+    phones = [value for kind, value in payments if kind == 'phone']
+    rows = (
+        db.session.query(Order.id, User.zelle_name, User.phone, Order.amount_paid)
+        .join(Order.user)
+        .filter(db.or_(Order.id.in_(ids), db.and_(User.phone.in_(phones), Order.source == 'regular')))
+        .order_by(Order.id).all()
+    )
+    by_id = {row.id: row for row in rows}
+    by_phone = {row.phone: row for row in rows if row.phone in phones}
+
+    amounts, changes, unchanged = {}, [], []
+    for (kind, value), (amount, line_no) in sorted(payments.items(), key=lambda item: item[1][1]):
+        row = by_id.get(value) if kind == 'id' else by_phone.get(value)
+        if row is None:
+            errors.append(f"Line {line_no}: no order for {'order #' if kind == 'id' else 'phone '}{value}")
+        elif row.id in amounts:
+            errors.append(f"Line {line_no}: order #{row.id} already has a payment in this paste")
+        elif abs((row.amount_paid or 0.0) - amount) < 0.005:
+            unchanged.append((row.id, row.zelle_name, row.phone, f"${amount:.2f}"))
+        else:
+            amounts[row.id] = amount
+            changes.append((row.id, row.zelle_name, row.phone, f"${row.amount_paid or 0.0:.2f}", f"${amount:.2f}"))
+
+    if amounts:
+        # One UPDATE ... SET amount_paid = CASE id WHEN ... END for every changed order
+        Order.query.filter(Order.id.in_(amounts)).update(
+            {Order.amount_paid: db.case(amounts, value=Order.id)}, synchronize_session=False,
+        )
+        _touch_orders(Order.id.in_(amounts))
+    db.session.commit()
+    return render_template(
+        'bulk_result.html',
+        title='Record payments',
+        changes=changes,
+        unchanged=unchanged,
+        errors=errors,
+        next_url=_next_url(),
+    )
 
 # Admin reset customer PIN
 @app.route('/reset_pin/<int:user_id>', methods=['POST'])
@@ -423,25 +1433,117 @@ def reset_pin(user_id):
     return redirect('/dashboard')
 
 
-with app.app_context():
-    db.create_all()
-    # Add price_snapshot column to existing order table if missing
-    try:
-        db.session.execute(db.text('ALTER TABLE "order" ADD COLUMN price_snapshot TEXT'))
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-    # Add pin_hash column to existing user table if missing
-    try:
-        db.session.execute(db.text('ALTER TABLE "user" ADD COLUMN pin_hash VARCHAR(256)'))
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-    # Seed ItemPrice from config defaults if table is empty
-    if ItemPrice.query.count() == 0:
-        for key, price in PRICES.items():
-            db.session.add(ItemPrice(key=key, price=price))
+def _parse_items_ordered(items_ordered):
+    """Recover {item_key: quantity} from a legacy items_ordered display string."""
+    quantities = {}
+    for key in PRICES:
+        label = LABELS[key]
+        if label + ":" in items_ordered:
+            try:
+                part = items_ordered.split(label + ":")[1].split(",")[0].strip().split()[0]
+                quantities[key] = float(part)
+            except (ValueError, IndexError):
+                continue
+    return quantities
+
+def backfill_order_items(batch_size=500):
+    """One-time migration: create OrderItem rows for orders saved before line items existed.
+
+    Runs as migration 5 or by hand, never at import. The last order id scanned is kept
+    in Config as `order_items_backfilled_through`, so a rerun starts after it: orders
+    whose display string resolves to no items are not rescanned, and orders placed since
+    then already get their line items from /submit_order.
+    """
+    fallback_prices = get_current_prices()
+    created = 0
+    last_id = _get_version('order_items_backfilled_through')
+    while True:
+        # Only the columns it needs, so this also runs (as a migration) before newer columns exist
+        orders = (
+            db.session.query(Order.id, Order.items_ordered, Order.price_snapshot)
+            .filter(Order.id > last_id, ~Order.items.any())
+            .order_by(Order.id).limit(batch_size).all()
+        )
+        if not orders:
+            break
+        for order in orders:
+            snapshot = json.loads(order.price_snapshot) if order.price_snapshot else fallback_prices
+            for key, qty in _parse_items_ordered(order.items_ordered).items():
+                if qty > 0:
+                    db.session.add(OrderItem(
+                        order_id=order.id, item_key=key, quantity=qty,
+                        unit_price=snapshot.get(key, fallback_prices[key]),
+                    ))
+                    created += 1
+        last_id = orders[-1].id
+        marker = Config.query.filter_by(key='order_items_backfilled_through').first()
+        if marker is None:
+            db.session.add(Config(key='order_items_backfilled_through', value=float(last_id)))
+        else:
+            marker.value = float(last_id)
         db.session.commit()
+    return created
+
+def dedupe_orders():
+    """Merge duplicate orders per customer and source into one; return the removed order ids.
+
+    The surviving order is the one an admin acted on: Confirmed first, then the most paid,
+    then the oldest. It becomes Confirmed if any duplicate was, and takes the sum of every
+    duplicate's amount_paid, so no recorded payment is lost. Each removed order is logged.
+    """
+    # Column tuples only: this runs as a migration, before newer Order columns exist
+    groups = {}
+    duplicated = (
+        db.select(Order.user_id, Order.source).group_by(Order.user_id, Order.source)
+        .having(func.count(Order.id) > 1)
+    )
+    for user_id, source in db.session.execute(duplicated).all():
+        rows = db.session.execute(
+            db.select(Order.id, Order.status, Order.amount_paid, Order.items_ordered)
+            .where(Order.user_id == user_id, Order.source == source)
+        ).all()
+        groups[(user_id, source)] = sorted(
+            rows, key=lambda row: (row.status != 'Confirmed', -(row.amount_paid or 0.0), row.id)
+        )
+
+    removed = []
+    for (user_id, source), (keep, *duplicates) in groups.items():
+        paid = sum(row.amount_paid or 0.0 for row in (keep, *duplicates))
+        status = 'Confirmed' if any(row.status == 'Confirmed' for row in duplicates) else keep.status
+        db.session.execute(
+            db.update(Order).where(Order.id == keep.id).values(status=status, amount_paid=paid)
+            .execution_options(synchronize_session=False)
+        )
+        for row in duplicates:
+            app.logger.warning(
+                "dedupe: removed order %s (user %s, %s, status %s, paid %.2f, items %r); "
+                "merged into order %s (status %s, paid %.2f)",
+                row.id, user_id, source, row.status, row.amount_paid or 0.0, row.items_ordered,
+                keep.id, status, paid,
+            )
+            removed.append(row.id)
+    if removed:
+        OrderItem.query.filter(OrderItem.order_id.in_(removed)).delete(synchronize_session=False)
+        db.session.execute(
+            db.delete(Order).where(Order.id.in_(removed)).execution_options(synchronize_session=False)
+        )
+    db.session.commit()
+    return removed
+
+@app.cli.command('backfill-order-items')
+def backfill_order_items_command():
+    """Create OrderItem rows for legacy orders not yet scanned (migration 5 does this on deploy)."""
+    print(f"Created {backfill_order_items()} order items")
+
+@app.cli.command('migrate')
+def migrate_command():
+    """Apply pending schema migrations (run once per deploy, before workers start)."""
+    from migrations import migrate
+    applied = migrate()
+    for version, description in applied:
+        print(f"applied {version:>3}  {description}")
+    print(f"{len(applied)} migration(s) applied")
+
 
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 5000))
@@ -0,0 +1,91 @@
+"""
+Order intake benchmark: per-request commit vs. the group-committed journal.
+
+Fires concurrent /submit_order posts at the app (via Flask's test client, so no
+network in the way) against a throwaway SQLite database, once per intake mode,
+and reports submissions/sec. For journal mode it also reports how long the
+committer took to apply everything to the database.
+
+Usage:
+    python benchmarks/bench_intake.py
+    python benchmarks/bench_intake.py --threads 32 --per-thread 50
+    DATABASE_URL=postgresql://... python benchmarks/bench_intake.py   # against a scratch Postgres
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_workdir = tempfile.mkdtemp(prefix="bench-intake-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_workdir, 'bench.db')}")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ADMIN_PASSWORD", "bench")
+os.environ.setdefault("ADMIN_PHONES", "5550000000")
+os.environ.setdefault("INTAKE_JOURNAL_PATH", os.path.join(_workdir, "intake_journal.db"))
+# Always in-memory: the default SQLite file is shared with the local app, whose limits a run would trip
+os.environ["RATELIMIT_STORAGE_URI"] = "memory://"
+# The KDF would dominate both modes equally; keep it cheap so commit cost shows
+os.environ.setdefault("PIN_HASH_METHOD", "pbkdf2:sha256:1000")
+
+from app import app, db, Order, intake_journal  # noqa: E402
+from migrations import migrate  # noqa: E402
+
+
+def run(mode, threads, per_thread, phone_base):
+    app.config["INTAKE_MODE"] = mode
+    app.config["WTF_CSRF_ENABLED"] = False
+
+    def worker(t):
+        client = app.test_client()
+        for i in range(per_thread):
+            rv = client.post("/submit_order", data={
+                "zelle_name": f"Bench {t}-{i}",
+                "phone": str(phone_base + t * per_thread + i),
+                "pin": "1234",
+                "cow_beef": "2",
+            })
+            assert rv.status_code == 200, rv.status_code
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    total = threads * per_thread
+    line = f"{mode:<8}{total:>8}{elapsed:>9.2f}s{total / elapsed:>10.1f}/s"
+
+    if mode == "journal":
+        drain_started = time.perf_counter()
+        while intake_journal.stats()["pending"]:
+            intake_journal.apply_pending()
+            time.sleep(0.01)
+        line += f"   applied to DB in {time.perf_counter() - drain_started:.2f}s"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16, help="concurrent clients (default: %(default)s)")
+    parser.add_argument("--per-thread", type=int, default=25, help="submissions per client (default: %(default)s)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        migrate()
+    print(f"database: {app.config['SQLALCHEMY_DATABASE_URI']}")
+    print(f"{'mode':<8}{'orders':>8}{'wall':>10}{'rate':>12}")
+    span = args.threads * args.per_thread
+    run("direct", args.threads, args.per_thread, 7000000000)
+    run("journal", args.threads, args.per_thread, 7000000000 + span)
+    with app.app_context():
+        assert db.session.query(Order).count() >= 2 * span
+
+
+if __name__ == "__main__":
+    main()
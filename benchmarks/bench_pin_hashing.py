@@ -0,0 +1,66 @@
+"""
+PIN hash-rate benchmark.
+
+Measures how many PIN checks per second one worker process can do at each KDF
+cost and pool size, and compares that with verifying a verified-customer token.
+
+Usage:
+    python benchmarks/bench_pin_hashing.py
+    python benchmarks/bench_pin_hashing.py --methods pbkdf2:sha256:600000 scrypt --threads 1 2 4 --seconds 3
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import generate_password_hash, check_password_hash  # noqa: E402
+
+import pins  # noqa: E402
+
+SECRET = "bench-secret"
+PHONE = "5551234567"
+PIN = "1234"
+
+
+def rate(fn, seconds, threads=1):
+    """Call fn() on `threads` threads for about `seconds`; return calls per second."""
+    deadline = time.perf_counter() + seconds
+
+    def loop():
+        n = 0
+        while time.perf_counter() < deadline:
+            fn()
+            n += 1
+        return n
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        total = sum(f.result() for f in [pool.submit(loop) for _ in range(threads)])
+    return total / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--methods", nargs="+", default=["pbkdf2:sha256:600000", "pbkdf2:sha256:260000", "scrypt"])
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time per measurement (default: %(default)s)")
+    args = parser.parse_args()
+
+    print(f"{'method':<24}{'threads':>8}{'checks/s':>12}{'ms/check':>10}")
+    for method in args.methods:
+        pin_hash = generate_password_hash(PIN, method=method)
+        for threads in args.threads:
+            per_sec = rate(lambda: check_password_hash(pin_hash, PIN), args.seconds, threads)
+            print(f"{method:<24}{threads:>8}{per_sec:>12.1f}{1000 * threads / per_sec:>10.1f}")
+
+    pin_hash = generate_password_hash(PIN, method=args.methods[0])
+    token = pins.issue_token(SECRET, PHONE, PIN, pin_hash)
+    per_sec = rate(lambda: pins.token_verifies(SECRET, token, PHONE, PIN, pin_hash), args.seconds)
+    print(f"{'token':<24}{1:>8}{per_sec:>12.1f}{1000 / per_sec:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
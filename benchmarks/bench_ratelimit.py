@@ -0,0 +1,77 @@
+"""
+Rate-limit storage benchmark: flask-limiter's in-memory counters vs. the shared SQLite file.
+
+Times `FixedWindowRateLimiter.hit()` (the call flask-limiter makes per request)
+against each storage, first from one process, then from several processes
+hitting the same keys at once the way gunicorn workers would. Also checks that
+the SQLite counters really are shared: N processes x M hits on one key must
+count to exactly N x M.
+
+Usage:
+    python benchmarks/bench_ratelimit.py
+    python benchmarks/bench_ratelimit.py --hits 20000 --procs 8
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from limits import parse  # noqa: E402
+from limits.storage import storage_from_string  # noqa: E402
+from limits.strategies import FixedWindowRateLimiter  # noqa: E402
+
+import ratelimit_storage  # noqa: E402,F401  registers sqlite://
+
+LIMIT = parse("1000000 per hour")
+
+
+def hammer(uri, hits, keys, tag=""):
+    """Hit `keys` distinct counters `hits` times in total; return microseconds per hit."""
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    started = time.perf_counter()
+    for i in range(hits):
+        limiter.hit(LIMIT, "bench", tag, str(i % keys))
+    return (time.perf_counter() - started) / hits * 1e6
+
+
+def _worker(args):
+    return hammer(*args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hits", type=int, default=5000, help="hits per process (default: %(default)s)")
+    parser.add_argument("--procs", type=int, default=4, help="concurrent processes (default: %(default)s)")
+    parser.add_argument("--keys", type=int, default=500, help="distinct phones/IPs (default: %(default)s)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-ratelimit-")
+    sqlite_uri = f"sqlite:///{os.path.join(workdir, 'ratelimit.db')}"
+
+    print(f"{'storage':<10}{'procs':>6}{'us/hit':>10}")
+    print(f"{'memory':<10}{1:>6}{hammer('memory://', args.hits, args.keys):>10.1f}")
+    print(f"{'sqlite':<10}{1:>6}{hammer(sqlite_uri, args.hits, args.keys, 'single'):>10.1f}")
+
+    with multiprocessing.get_context("fork").Pool(args.procs) as pool:
+        timings = pool.map(_worker, [(sqlite_uri, args.hits, args.keys, "multi")] * args.procs)
+    print(f"{'sqlite':<10}{args.procs:>6}{max(timings):>10.1f}   (slowest process)")
+
+    storage = storage_from_string(sqlite_uri)
+    limiter = FixedWindowRateLimiter(storage)
+    counted = sum(
+        limiter.get_window_stats(LIMIT, "bench", "multi", str(k))[1] for k in range(args.keys)
+    )
+    expected = args.procs * args.hits
+    used = LIMIT.amount * args.keys - counted
+    print(f"shared count: {used} of {expected} hits {'OK' if used == expected else 'MISMATCH'}")
+    if used != expected:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
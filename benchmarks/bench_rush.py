@@ -0,0 +1,219 @@
+"""
+Order-window rush simulation: throughput and p50/p95/p99 latency per route.
+
+Drives the app the way the first minutes of an order window do, through Flask's
+test client with the same settings as the test fixture (CSRF and rate limits
+off, throwaway SQLite database):
+
+- customers load `/`, post `/submit_order` with random items and PINs, and
+  some come back to change their order (a resubmit with the same PIN);
+- admins poll `/dashboard` and every few polls bulk-confirm pending orders
+  through `/bulk/orders`.
+
+Results are printed and saved as JSON (with the git commit) so runs can be
+compared across commits with --compare.
+
+Usage:
+    python benchmarks/bench_rush.py
+    python benchmarks/bench_rush.py --customers 500 --concurrency 32 --admins 3
+    python benchmarks/bench_rush.py --compare benchmarks/results/rush-abc1234.json
+    python benchmarks/bench_rush.py --database-url postgresql://localhost/rush_bench   # scratch Postgres
+"""
+import argparse
+import json
+import os
+import queue
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--customers", type=int, default=200, help="customers placing orders (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=16, help="customers active at once (default: %(default)s)")
+    parser.add_argument("--edit-rate", type=float, default=0.3,
+                        help="share of customers who come back to change their order (default: %(default)s)")
+    parser.add_argument("--admins", type=int, default=2, help="admins polling the dashboard (default: %(default)s)")
+    parser.add_argument("--poll-seconds", type=float, default=0.5, help="admin poll interval (default: %(default)s)")
+    parser.add_argument("--confirm-every", type=int, default=4,
+                        help="admins bulk-confirm pending orders every Nth poll (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: %(default)s)")
+    parser.add_argument("--database-url", help="run against this database instead of a temp SQLite file")
+    parser.add_argument("--out", help="JSON results file (default: benchmarks/results/rush-<commit>.json)")
+    parser.add_argument("--compare", help="earlier JSON results to diff against")
+    return parser.parse_args()
+
+
+args = parse_args()
+_workdir = tempfile.mkdtemp(prefix="bench-rush-")
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(_workdir, 'bench.db')}"
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ADMIN_PASSWORD", "bench")
+os.environ.setdefault("ADMIN_PHONES", "5550000000")
+os.environ.setdefault("RATELIMIT_STORAGE_URI", "memory://")
+os.environ.setdefault("INTAKE_JOURNAL_PATH", os.path.join(_workdir, "intake_journal.db"))
+os.environ.setdefault("PIN_HASH_METHOD", "pbkdf2:sha256:1000")  # as in test_app.py
+
+from app import app, db, limiter, Order  # noqa: E402
+from config import PRICES  # noqa: E402
+from migrations import migrate  # noqa: E402
+
+
+class Recorder:
+    """Collects per-route latencies and error counts from every simulated client."""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def call(self, route, fn, *args, **kwargs):
+        started = time.perf_counter()
+        rv = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.samples.setdefault(route, []).append(elapsed)
+            if rv.status_code >= 400:
+                self.errors[route] = self.errors.get(route, 0) + 1
+        return rv
+
+    def summary(self, wall):
+        routes = {}
+        for route, latencies in sorted(self.samples.items()):
+            cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+            routes[route] = {
+                "requests": len(latencies),
+                "errors": self.errors.get(route, 0),
+                "throughput_rps": round(len(latencies) / wall, 2),
+                "p50_ms": round(cuts[49] * 1000, 2),
+                "p95_ms": round(cuts[94] * 1000, 2),
+                "p99_ms": round(cuts[98] * 1000, 2),
+            }
+        return routes
+
+
+def order_form(rng, phone, pin):
+    form = {"zelle_name": f"Rush {phone}", "phone": phone, "pin": pin}
+    for key in rng.sample(sorted(PRICES), rng.randint(1, 4)):
+        form[key] = str(rng.randint(1, 5))
+    return form
+
+
+def customer(recorder, rng, phone, edit_rate):
+    client = app.test_client()
+    pin = f"{rng.randint(0, 9999):04d}"
+    recorder.call("GET /", client.get, "/")
+    recorder.call("POST /submit_order", client.post, "/submit_order", data=order_form(rng, phone, pin))
+    if rng.random() < edit_rate:
+        for _ in range(rng.randint(1, 2)):
+            recorder.call("POST /submit_order (edit)", client.post, "/submit_order", data=order_form(rng, phone, pin))
+
+
+def admin(recorder, done, poll_seconds, confirm_every):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["admin"] = True
+    polls = 0
+    while not done.is_set():
+        recorder.call("GET /dashboard", client.get, "/dashboard")
+        polls += 1
+        if polls % confirm_every == 0:
+            with app.app_context():
+                pending = db.session.execute(
+                    db.select(Order.id).where(Order.status == "Pending").order_by(Order.id).limit(50)
+                ).scalars().all()
+            if pending:
+                recorder.call("POST /bulk/orders", client.post, "/bulk/orders",
+                              data={"action": "confirm", "order_ids": [str(i) for i in pending]})
+        done.wait(poll_seconds)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_table(routes, baseline=None):
+    print(f"{'route':<28}{'reqs':>7}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for route, r in routes.items():
+        line = (f"{route:<28}{r['requests']:>7}{r['errors']:>5}{r['throughput_rps']:>9.1f}"
+                f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+        old = (baseline or {}).get(route)
+        if old and old["p95_ms"]:
+            line += f"   p95 {100 * (r['p95_ms'] / old['p95_ms'] - 1):+.0f}% vs baseline"
+        print(line)
+
+
+def main():
+    app.config.update({"TESTING": True, "WTF_CSRF_ENABLED": False})
+    limiter.enabled = False  # every simulated client shares one address, as in the test fixture
+    with app.app_context():
+        migrate()
+        dialect = db.engine.dialect.name
+
+    rng = random.Random(args.seed)
+    phone_base = 6000000000 + int(time.time()) % 1000 * 1000000  # fresh customers on a reused database
+    customers = queue.Queue()
+    for i in range(args.customers):
+        customers.put((str(phone_base + i), random.Random(rng.random())))
+
+    recorder = Recorder()
+    done = threading.Event()
+
+    def customer_worker():
+        while True:
+            try:
+                phone, customer_rng = customers.get_nowait()
+            except queue.Empty:
+                return
+            customer(recorder, customer_rng, phone, args.edit_rate)
+
+    admins = [threading.Thread(target=admin, args=(recorder, done, args.poll_seconds, args.confirm_every))
+              for _ in range(args.admins)]
+    workers = [threading.Thread(target=customer_worker) for _ in range(args.concurrency)]
+    started = time.perf_counter()
+    for thread in admins + workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    done.set()
+    for thread in admins:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    result = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "database": dialect,
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "database_url")},
+        "wall_seconds": round(wall, 2),
+        "routes": recorder.summary(wall),
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["routes"]
+    print(f"commit {result['commit']}  {result['database']}  {args.customers} customers, "
+          f"{args.concurrency} concurrent, {args.admins} admins  wall {wall:.1f}s")
+    print_table(result["routes"], baseline)
+
+    out = args.out or os.path.join(ROOT, "benchmarks", "results", f"rush-{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"saved {out}")
+
+
+if __name__ == "__main__":
+    main()
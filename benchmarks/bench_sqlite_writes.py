@@ -0,0 +1,123 @@
+"""
+Concurrent SQLite write benchmark: SQLAlchemy defaults vs. the db_profile settings.
+
+Starts several processes (standing in for gunicorn workers), each with a few
+threads, that all run an order-submission-shaped transaction against one SQLite
+file: look the customer up, insert or update them, insert an order, commit. The
+same load runs once with a stock engine (rollback journal) and once with
+db_profile's engine options and pragmas, and reports commits/sec, p95 commit
+latency and how many transactions failed with "database is locked".
+
+Usage:
+    python benchmarks/bench_sqlite_writes.py
+    python benchmarks/bench_sqlite_writes.py --procs 4 --threads 8 --seconds 10
+    SQLITE_SYNCHRONOUS=FULL python benchmarks/bench_sqlite_writes.py   # price of full fsync
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+import db_profile  # noqa: E402
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS user (id INTEGER PRIMARY KEY, phone TEXT UNIQUE, name TEXT)",
+    "CREATE TABLE IF NOT EXISTS orders (id INTEGER PRIMARY KEY, user_id INTEGER, items TEXT, total REAL)",
+]
+
+
+def make_engine(uri, profile):
+    if not profile:
+        return create_engine(uri)
+    engine = create_engine(uri, **db_profile.engine_options(uri))
+    db_profile.install(engine)
+    return engine
+
+
+def worker(uri, profile, threads, seconds, seed):
+    """Run `threads` writers for `seconds`; return (latencies in seconds, locked errors)."""
+    engine = make_engine(uri, profile)
+    latencies, errors = [], [0]
+    deadline = time.perf_counter() + seconds
+
+    def run(t):
+        i = 0
+        while time.perf_counter() < deadline:
+            phone = f"{seed:03d}{t:03d}{i % 50:04d}"  # repeat customers, like resubmissions
+            i += 1
+            started = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    user_id = conn.execute(text("SELECT id FROM user WHERE phone = :p"), {"p": phone}).scalar()
+                    if user_id is None:
+                        user_id = conn.execute(
+                            text("INSERT INTO user (phone, name) VALUES (:p, :n) RETURNING id"),
+                            {"p": phone, "n": f"Bench {phone}"},
+                        ).scalar()
+                    else:
+                        conn.execute(text("UPDATE user SET name = :n WHERE id = :id"), {"n": f"Bench {i}", "id": user_id})
+                    conn.execute(
+                        text("INSERT INTO orders (user_id, items, total) VALUES (:u, :items, :total)"),
+                        {"u": user_id, "items": "Cow Beef: 2 lb", "total": 16.0},
+                    )
+                latencies.append(time.perf_counter() - started)
+            except OperationalError as exc:
+                if "locked" not in str(exc):
+                    raise
+                errors[0] += 1
+
+    pool = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    engine.dispose()
+    return latencies, errors[0]
+
+
+def _worker(args):
+    return worker(*args)
+
+
+def bench(label, profile, procs, threads, seconds):
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-sqlite-"), "bench.db")
+    uri = f"sqlite:///{path}"
+    setup = make_engine(uri, profile)
+    with setup.begin() as conn:
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+    setup.dispose()
+
+    with multiprocessing.get_context("fork").Pool(procs) as pool:
+        results = pool.map(_worker, [(uri, profile, threads, seconds, p) for p in range(procs)])
+    latencies = sorted(lat for lats, _ in results for lat in lats)
+    errors = sum(err for _, err in results)
+    p95 = statistics.quantiles(latencies, n=20)[-1] * 1000 if len(latencies) > 1 else float("nan")
+    print(f"{label:<10}{len(latencies) / seconds:>12.1f}{p95:>12.1f}{errors:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--procs", type=int, default=4, help="writer processes (default: %(default)s)")
+    parser.add_argument("--threads", type=int, default=8, help="threads per process (default: %(default)s)")
+    parser.add_argument("--seconds", type=float, default=5, help="duration per engine (default: %(default)s)")
+    args = parser.parse_args()
+
+    print(f"{args.procs} processes x {args.threads} threads, {args.seconds:g}s each")
+    print(f"{'engine':<10}{'commits/s':>12}{'p95 ms':>12}{'locked':>10}")
+    bench("default", False, args.procs, args.threads, args.seconds)
+    bench("profile", True, args.procs, args.threads, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Worker cold-start benchmark, based on `python -X importtime`.
+
+Imports the app in a fresh interpreter several times and reports the median
+time to `import app`, the slowest modules it pulls in directly, and whether
+any module that should load lazily (ReportLab) was imported at boot.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --top 15
+    python benchmarks/bench_startup.py --budget-ms 800    # exit 1 if the median is slower (for CI)
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only load on first use, never during worker boot
+LAZY_MODULES = ("reportlab",)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_profile():
+    """Import app in a fresh interpreter; return [(self_us, cumulative_us, depth, module)]."""
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "bench")
+    env.setdefault("ADMIN_PASSWORD", "bench")
+    env.setdefault("ADMIN_PHONES", "5550000000")
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", "import app"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, module))
+    return rows
+
+
+def app_children(rows):
+    """Return the rows imported directly by app (children are logged before their parent)."""
+    end = next(i for i, row in enumerate(rows) if row[2] == 0 and row[3] == "app")
+    start = max((i for i in range(end) if rows[i][2] == 0), default=-1) + 1
+    return [row for row in rows[start:end] if row[2] == 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list (default: %(default)s)")
+    parser.add_argument("--budget-ms", type=float, help="fail if the median import time exceeds this")
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = [next(row[1] for row in rows if row[3] == "app" and row[2] == 0) / 1000 for rows in profiles]
+    median = statistics.median(totals)
+    print(f"import app: median {median:.0f} ms  (min {min(totals):.0f}, max {max(totals):.0f}, {args.runs} runs)")
+
+    last = profiles[-1]
+    app_self = next(row[0] for row in last if row[3] == "app" and row[2] == 0) / 1000
+    print(f"  app module body: {app_self:.0f} ms")
+    for _, cumulative_us, _, module in sorted(app_children(last), key=lambda r: -r[1])[:args.top]:
+        print(f"  {cumulative_us / 1000:7.1f} ms  {module}")
+
+    loaded = sorted({row[3] for row in last} & set(LAZY_MODULES))
+    if loaded:
+        print(f"FAIL: loaded at boot but should be lazy: {', '.join(loaded)}")
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"FAIL: median {median:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+    if loaded or (args.budget_ms is not None and median > args.budget_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,7 +41,9 @@ UNITS = {
 
 ALLOWED_ADMINS = os.getenv("ADMIN_PHONES", "").split(",")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
+# Optional: a precomputed Werkzeug hash of the admin password; takes precedence over ADMIN_PASSWORD
+ADMIN_PASSWORD_HASH = os.getenv("ADMIN_PASSWORD_HASH")
 ZELLE_HANDLE = os.getenv("ZELLE_HANDLE", "")
 
-if not ADMIN_PASSWORD:
-    raise ValueError("ADMIN_PASSWORD environment variable is not set.")
+if not ADMIN_PASSWORD and not ADMIN_PASSWORD_HASH:
+    raise ValueError("ADMIN_PASSWORD (or ADMIN_PASSWORD_HASH) environment variable is not set.")
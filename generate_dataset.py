@@ -0,0 +1,191 @@
+"""
+Synthetic order window for scale testing, bulk-loaded into the app's database.
+
+Generates N customers with one regular order each, priced from the current item
+prices (config.PRICES as seeded into ItemPrice) with the same display strings,
+line items and price snapshots /submit_order writes. Item mixes follow rough
+real-window popularity, a share of orders carry an older price snapshot from
+before a mid-window price change, and payments range from unpaid through
+partial to paid in full, with a configurable share confirmed.
+
+Rows are written in batches with COPY on Postgres and executemany on SQLite, so
+500k orders load in well under a minute; then point the dashboard, exports or
+benchmarks/bench_rush.py at the same DATABASE_URL.
+
+Usage:
+    python generate_dataset.py --orders 10000
+    python generate_dataset.py --orders 500000 --confirmed 0.7 --seed 7
+    python generate_dataset.py --orders 50000 --replace     # scratch DB: drop existing customers first
+
+Reads DATABASE_URL (and the other app env vars) the same way the web app does.
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import time
+
+FIRST_NAMES = ["Aisha", "Omar", "Fatima", "Yusuf", "Maryam", "Ali", "Khadija", "Ibrahim", "Zainab", "Hassan",
+               "Sara", "Bilal", "Amina", "Tariq", "Noor", "Imran", "Hina", "Kareem", "Layla", "Samir",
+               "Rachel", "Derek", "Jessica", "Mark", "Jennifer"]
+LAST_NAMES = ["Khan", "Ahmed", "Rahman", "Hussain", "Siddiqui", "Chowdhury", "Malik", "Sheikh", "Qureshi",
+              "Ali", "Patel", "Mirza", "Rivera", "Black", "Diaz", "Matthews", "Robertson", "Haque"]
+
+# Relative popularity and typical quantity range per item; unknown keys get (1, 1, 3)
+ITEM_MIX = {
+    "cow_beef": (10, 2, 20),
+    "goat": (8, 2, 15),
+    "desi_chicken_skin_off": (5, 1, 6),
+    "desi_chicken_skin_on": (4, 1, 6),
+    "young_hen": (3, 1, 4),
+    "rooster": (2, 1, 3),
+    "broiler": (3, 1, 3),
+    "duck": (1, 1, 2),
+    "quail": (2, 2, 12),
+    "eggs": (6, 1, 4),
+}
+
+# How many distinct items an order has, and how often
+ITEMS_PER_ORDER = ([1, 2, 3, 4, 5], [35, 30, 20, 10, 5])
+
+TABLES = {
+    "user": ("id", "zelle_name", "phone", "pin_hash"),
+    "order": ("id", "user_id", "items_ordered", "total_price_usd", "status", "source",
+              "amount_paid", "price_snapshot", "revision"),
+    "order_item": ("id", "order_id", "item_key", "quantity", "unit_price"),
+}
+
+
+def _payment(rng, total, confirmed):
+    """Amount paid so far: confirmed orders are mostly paid in full, pending ones mostly unpaid."""
+    roll = rng.random()
+    if confirmed:
+        if roll < 0.75:
+            return total
+        if roll < 0.95:
+            return round(total * rng.choice([0.25, 0.5, 0.75]), 2)
+        return round(total + rng.choice([5, 10, 20]), 2)  # overpaid
+    return 0.0 if roll < 0.8 else round(total * rng.choice([0.25, 0.5]), 2)
+
+
+def generate(count, prices, labels, units, rng, confirmed_ratio, first_ids, pin_hash, revision, batch_size):
+    """Yield {table: [row tuples]} batches for `count` customers, ids starting at `first_ids`."""
+    user_id, order_id, item_id = first_ids
+    keys = list(prices)
+    weights = [ITEM_MIX.get(key, (1, 1, 3))[0] for key in keys]
+    current = json.dumps(prices)
+    # Orders placed before a mid-window price change carry the old prices in their snapshot
+    old_prices = {key: round(price * 0.9, 2) for key, price in prices.items()}
+    earlier = json.dumps(old_prices)
+
+    batch = {table: [] for table in TABLES}
+    for _ in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        batch["user"].append((user_id, name, f"8{user_id:09d}", pin_hash))
+
+        before_change = rng.random() < 0.3
+        snapshot_prices, snapshot = (old_prices, earlier) if before_change else (prices, current)
+        chosen = set()
+        while len(chosen) < min(rng.choices(*ITEMS_PER_ORDER)[0], len(keys)):
+            chosen.add(rng.choices(keys, weights)[0])
+        display, total = [], 0.0
+        for key in sorted(chosen, key=keys.index):
+            _, low, high = ITEM_MIX.get(key, (1, 1, 3))
+            quantity = float(rng.randint(low, high))
+            unit_price = snapshot_prices[key]
+            total += quantity * unit_price
+            display.append(f"{labels.get(key, key)}: {int(quantity)} {units.get(key, 'each')}")
+            batch["order_item"].append((item_id, order_id, key, quantity, unit_price))
+            item_id += 1
+
+        confirmed = rng.random() < confirmed_ratio
+        total = round(total, 2)
+        batch["order"].append((
+            order_id, user_id, ", ".join(display), total, "Confirmed" if confirmed else "Pending",
+            "regular", _payment(rng, total, confirmed), snapshot, revision,
+        ))
+        user_id += 1
+        order_id += 1
+        if len(batch["order"]) >= batch_size:
+            yield batch
+            batch = {table: [] for table in TABLES}
+    if batch["order"]:
+        yield batch
+
+
+def _copy(connection, table, rows):
+    """Postgres: stream rows through COPY ... FROM STDIN as CSV."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+    buffer.seek(0)
+    columns = ", ".join(TABLES[table])
+    with connection.connection.dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(f'COPY "{table}" ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+
+def _executemany(connection, table, rows):
+    columns = TABLES[table]
+    placeholders = ", ".join("?" for _ in columns)
+    cursor = connection.connection.dbapi_connection.cursor()
+    cursor.executemany(f'INSERT INTO "{table}" ({", ".join(columns)}) VALUES ({placeholders})', rows)
+    cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=10000, help="customers/orders to create (default: %(default)s)")
+    parser.add_argument("--confirmed", type=float, default=0.6, help="share of orders confirmed (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: %(default)s)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="orders per bulk write (default: %(default)s)")
+    parser.add_argument("--replace", action="store_true",
+                        help="delete every existing customer and order first (scratch databases only)")
+    args = parser.parse_args()
+
+    import pins
+    from app import app, db, User, Order, OrderItem, OrderTombstone, get_current_prices, _bump_version
+    from config import LABELS, UNITS
+    from migrations import migrate
+
+    with app.app_context():
+        migrate()
+        if args.replace:
+            for model in (OrderItem, OrderTombstone, Order, User):
+                db.session.query(model).delete()
+        elif db.session.query(Order.id).first() is not None:
+            parser.error("the database already has orders; use --replace on a scratch database")
+
+        started = time.perf_counter()
+        first_ids = tuple(
+            (db.session.query(db.func.max(model.id)).scalar() or 0) + 1 for model in (User, Order, OrderItem)
+        )
+        revision = _bump_version("orders_version")
+        pin_hash = pins.hash_pin("1234")  # every generated customer's PIN is 1234
+        connection = db.session.connection()
+        postgres = db.engine.dialect.name == "postgresql"
+        write = _copy if postgres else _executemany
+
+        rows = dict.fromkeys(TABLES, 0)
+        rng = random.Random(args.seed)
+        for batch in generate(args.orders, get_current_prices(), LABELS, UNITS, rng, args.confirmed,
+                              first_ids, pin_hash, revision, args.batch_size):
+            for table in TABLES:  # parents first, for the foreign keys
+                write(connection, table, batch[table])
+                rows[table] += len(batch[table])
+        if postgres:
+            for table in TABLES:
+                connection.execute(db.text(
+                    f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), (SELECT MAX(id) FROM \"{table}\"))"
+                ))
+        db.session.commit()
+
+        elapsed = time.perf_counter() - started
+        total = sum(rows.values())
+        print(f"{db.engine.dialect.name}: {rows['user']} customers, {rows['order']} orders, "
+              f"{rows['order_item']} line items in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
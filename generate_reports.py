@@ -0,0 +1,77 @@
+"""
+End-of-window reports, generated from the live database in one command.
+
+Reads orders, customers, line items and settings once into an in-memory snapshot,
+then renders the reports concurrently in a process pool (one process per report,
+up to --workers) and prints how long each one took.
+
+Usage:
+    python generate_reports.py                              # all reports into the current dir
+    python generate_reports.py -o reports/ --only fcfs demand
+    python generate_reports.py --demand-json demand.json    # also write demand for the farm's sheet
+
+Reads DATABASE_URL (and the other app env vars) the same way the web app does.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import reports
+
+# name -> (output file, renderer, snapshot key it needs; None = whole snapshot)
+REPORTS = {
+    "fcfs":     ("FCFS_Order_Priority_Report.pdf", reports.render_fcfs_pdf, None),
+    "demand":   ("Item_Demand_Breakdown.pdf", reports.render_item_demand_pdf, "demand"),
+    "snapshot": ("Orders_Dashboard_Snapshot.pdf", reports.render_dashboard_snapshot_pdf, None),
+}
+
+
+def load_snapshot():
+    """Read the live data once. The app is imported here so render processes never load it."""
+    from app import app, build_report_snapshot
+    with app.app_context():
+        return build_report_snapshot()
+
+
+def _render(name, data, path):
+    started = time.perf_counter()
+    REPORTS[name][1](data, path)
+    return name, path, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output-dir", default=".", help="directory for the PDFs (default: %(default)s)")
+    parser.add_argument("--only", nargs="+", choices=sorted(REPORTS), help="render just these reports")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="render processes (default: CPU count)")
+    parser.add_argument("--demand-json", metavar="PATH", help="also write the item demand breakdown as JSON")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    started = time.perf_counter()
+    snapshot = load_snapshot()
+    print(f"{'snapshot':<10}{time.perf_counter() - started:7.2f}s  {len(snapshot['orders'])} orders")
+
+    if args.demand_json:
+        with open(args.demand_json, "w") as f:
+            json.dump(snapshot["demand"], f, indent=2, ensure_ascii=False)
+        print(f"{'json':<10}{'':>8}  {args.demand_json}")
+
+    names = args.only or list(REPORTS)
+    render_started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(names)))) as pool:
+        futures = []
+        for name in names:
+            filename, _, key = REPORTS[name]
+            data = snapshot[key] if key else snapshot
+            futures.append(pool.submit(_render, name, data, os.path.join(args.output_dir, filename)))
+        for future in as_completed(futures):
+            name, path, elapsed = future.result()
+            print(f"{name:<10}{elapsed:7.2f}s  {path}")
+    print(f"{'total':<10}{time.perf_counter() - started:7.2f}s  (rendering {time.perf_counter() - render_started:.2f}s wall)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Durable intake journal for the order-window rush.
+
+With INTAKE_MODE=journal, /submit_order validates a submission, appends it to a
+local SQLite journal and confirms from the journal entry, instead of
+committing to the main database inside the request.
+
+Appends are group-committed: request threads hand their entries to one writer
+thread, which writes everything waiting in a single transaction (one fsync) and
+then wakes those requests. A committer thread applies journaled entries to the
+main database in batched transactions, in journal order. A lease row in the
+journal lets only one worker process apply at a time, so two submissions from
+the same customer are never applied out of order.
+
+Entries are deleted as soon as the batch that applied them commits, so the
+journal holds only the backlog (plus rejected entries, kept with their error)
+rather than growing for the whole order window.
+"""
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entry (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    phone TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    applied REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_entry_pending ON entry (id) WHERE applied IS NULL;
+CREATE INDEX IF NOT EXISTS ix_entry_phone ON entry (phone, id);
+CREATE TABLE IF NOT EXISTS tally (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lease (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+class IntakeJournal:
+    """Group-committed journal of submissions plus the thread that applies them.
+
+    `apply_batch(entries)` receives a list of (entry_id, payload dict) in journal
+    order, must write them to the main database in one transaction, and returns
+    {entry_id: error message} for entries it rejected. If it raises, nothing is
+    marked applied and the batch is retried.
+    """
+
+    def __init__(self, path, apply_batch, batch_size=200, lease_seconds=30):
+        self.path = path
+        self.apply_batch = apply_batch
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self._owner = uuid.uuid4().hex
+        self._queue = queue.Queue()
+        self._wake = threading.Event()
+        self._local = threading.local()
+        self._start_lock = threading.Lock()
+        self._apply_lock = threading.Lock()
+        self._started_pid = None
+
+    def start(self):
+        """Start the writer and committer threads in this process (again after a fork)."""
+        with self._start_lock:
+            if self._started_pid == os.getpid():
+                return
+            self._owner = uuid.uuid4().hex
+            self._queue = queue.Queue()
+            self._local = threading.local()
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn().executescript(_SCHEMA)
+            threading.Thread(target=self._writer, name='intake-writer', daemon=True).start()
+            threading.Thread(target=self._committer, name='intake-committer', daemon=True).start()
+            self._started_pid = os.getpid()
+
+    def append(self, phone, payload):
+        """Durably journal a submission and return its entry id once it is on disk."""
+        self.start()
+        waiter = {'done': threading.Event(), 'id': None, 'error': None}
+        self._queue.put((phone, json.dumps(payload), waiter))
+        waiter['done'].wait()
+        if waiter['error'] is not None:
+            raise waiter['error']
+        return waiter['id']
+
+    def pending_pin_hash(self, phone):
+        """Return the PIN hash of this phone's newest unapplied entry, or None."""
+        self.start()
+        row = self._conn().execute(
+            "SELECT payload FROM entry WHERE phone = ? AND applied IS NULL ORDER BY id DESC LIMIT 1",
+            (phone,),
+        ).fetchone()
+        return json.loads(row[0])['pin_hash'] if row else None
+
+    def stats(self):
+        """Return counts of pending, applied and rejected entries."""
+        self.start()
+        # Applied entries are deleted and counted in `tally`; rows marked applied are from older journals
+        pending, applied, rejected = self._conn().execute(
+            "SELECT COUNT(*) - COUNT(applied),"
+            " COUNT(applied) - COUNT(error) + (SELECT COALESCE(SUM(value), 0) FROM tally WHERE name = 'applied'),"
+            " COUNT(error) FROM entry"
+        ).fetchone()
+        return {'pending': pending, 'applied': applied, 'rejected': rejected}
+
+    def apply_pending(self):
+        """Apply every pending entry now, unless another process holds the lease; return how many."""
+        self.start()
+        with self._apply_lock:
+            return self._apply_pending(self._conn())
+
+    def _apply_pending(self, conn):
+        applied = 0
+        if not self._take_lease(conn):
+            return 0
+        try:
+            while True:
+                rows = conn.execute(
+                    "SELECT id, payload FROM entry WHERE applied IS NULL ORDER BY id LIMIT ?",
+                    (self.batch_size,),
+                ).fetchall()
+                if not rows:
+                    return applied
+                errors = self.apply_batch([(entry_id, json.loads(payload)) for entry_id, payload in rows])
+                now = time.time()
+                done = [(entry_id,) for entry_id, _ in rows if entry_id not in errors]
+                with conn:
+                    conn.executemany(
+                        "UPDATE entry SET applied = ?, error = ? WHERE id = ?",
+                        [(now, error, entry_id) for entry_id, error in errors.items()],
+                    )
+                    conn.executemany("DELETE FROM entry WHERE id = ?", done)
+                    conn.execute(
+                        "INSERT INTO tally (name, value) VALUES ('applied', ?)"
+                        " ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                        (len(done),),
+                    )
+                applied += len(rows)
+                for entry_id, error in errors.items():
+                    log.warning("intake entry %s rejected: %s", entry_id, error)
+                if not self._take_lease(conn):
+                    return applied
+        finally:
+            with conn:
+                conn.execute("DELETE FROM lease WHERE name = 'committer' AND owner = ?", (self._owner,))
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")  # an acknowledged submission survives power loss
+            self._local.conn = conn
+        return conn
+
+    def _take_lease(self, conn):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT owner, expires FROM lease WHERE name = 'committer'").fetchone()
+            if row and row[0] != self._owner and row[1] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO lease (name, owner, expires) VALUES ('committer', ?, ?)",
+                (self._owner, now + self.lease_seconds),
+            )
+            return True
+        finally:
+            conn.execute("COMMIT")
+
+    def _writer(self):
+        conn = self._conn()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            now = time.time()
+            try:
+                conn.execute("BEGIN")
+                for phone, payload, waiter in batch:
+                    waiter['id'] = conn.execute(
+                        "INSERT INTO entry (created, phone, payload) VALUES (?, ?, ?)", (now, phone, payload)
+                    ).lastrowid
+                conn.execute("COMMIT")
+            except Exception as exc:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                for _, _, waiter in batch:
+                    waiter['error'] = exc
+            for _, _, waiter in batch:
+                waiter['done'].set()
+            self._wake.set()
+
+    def _committer(self):
+        while True:
+            # Woken by each journal flush; the timeout picks up entries left by other workers
+            self._wake.wait(timeout=1.0)
+            self._wake.clear()
+            try:
+                self.apply_pending()
+            except Exception:
+                log.exception("applying intake journal failed; retrying")
+                time.sleep(1.0)
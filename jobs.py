@@ -0,0 +1,108 @@
+"""Local background job runner for heavy report generation.
+
+Jobs run on a small thread pool inside each app worker, with no external broker.
+Job state is written as JSON files in a shared directory, so a status poll or a
+download can be answered by any gunicorn worker on the same host, not only the
+worker that accepted the job.
+"""
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+class QueueFull(Exception):
+    """Raised when this worker already has its maximum number of jobs queued or running."""
+
+
+class JobRunner:
+    """Bounded pool that runs jobs off the request path and records their state on disk.
+
+    `max_workers` caps how many jobs render at once and `max_pending` caps how many
+    may be queued or running per process, so report exports can't crowd out request
+    handling. Finished job records older than `ttl_seconds` are pruned on submit.
+    """
+
+    def __init__(self, job_dir, max_workers=1, max_pending=4, ttl_seconds=3600):
+        self.job_dir = job_dir
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-job')
+        self._lock = threading.Lock()
+        self._active = {}  # dedupe key -> job id, for jobs queued or running in this process
+
+    def submit(self, kind, fn, *args, key=None):
+        """Queue fn(*args) and return its job id; identical `key`s share one job."""
+        with self._lock:
+            if key is not None and key in self._active:
+                return self._active[key]
+            if len(self._active) >= self.max_pending:
+                raise QueueFull()
+            job_id = uuid.uuid4().hex
+            self._active[key or job_id] = job_id
+
+        self._prune()
+        self._write(job_id, status='queued', kind=kind, created=time.time())
+        self._executor.submit(self._run, job_id, key or job_id, kind, fn, args)
+        return job_id
+
+    def record(self, kind, result):
+        """Record an already-finished job (e.g. a cache hit) so clients can poll it the same way."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._write(job_id, status='done', kind=kind, created=now, finished=now, result=result)
+        return job_id
+
+    def get(self, job_id):
+        """Return the job's state dict, or None for an unknown or malformed id."""
+        if not _JOB_ID.match(job_id or ''):
+            return None
+        try:
+            with open(self._path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _run(self, job_id, key, kind, fn, args):
+        created = self.get(job_id)['created']
+        self._write(job_id, status='running', kind=kind, created=created, started=time.time())
+        try:
+            result = fn(*args)
+        except Exception as exc:
+            self._write(job_id, status='failed', kind=kind, created=created,
+                        finished=time.time(), error=str(exc) or exc.__class__.__name__)
+        else:
+            self._write(job_id, status='done', kind=kind, created=created,
+                        finished=time.time(), result=result)
+        finally:
+            with self._lock:
+                self._active.pop(key, None)
+
+    def _path(self, job_id):
+        return os.path.join(self.job_dir, f"{job_id}.json")
+
+    def _write(self, job_id, **state):
+        os.makedirs(self.job_dir, exist_ok=True)
+        tmp_path = self._path(job_id) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(dict(state, id=job_id), f)
+        os.replace(tmp_path, self._path(job_id))
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl_seconds
+        try:
+            names = os.listdir(self.job_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.job_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
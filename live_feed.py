@@ -0,0 +1,109 @@
+"""Per-worker event bus for the dashboard's live feed (Server-Sent Events).
+
+Every gunicorn worker runs one background thread that polls the database's
+`orders_version` counter. When it moves, the thread reads what changed once and
+fans the change out to all SSE clients connected to that worker. Workers don't
+talk to each other: each one sees every commit through the shared database, so
+no broker is needed, and the database sees one cheap poll per worker per
+interval no matter how many admins are watching.
+"""
+import logging
+import os
+import queue
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class TooManySubscribers(Exception):
+    """Raised when this worker already streams to its maximum number of clients."""
+
+
+class Subscription:
+    """One connected client's bounded event queue."""
+
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def get(self, timeout):
+        """Return the next change dict, or None if nothing arrived within `timeout` seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _offer(self, change):
+        try:
+            self._queue.put_nowait(change)
+        except queue.Full:
+            # A client this far behind gets told to reload instead of holding memory
+            self.overflowed = True
+
+
+class RevisionBus:
+    """Polls `fetch_revision()` every `interval` seconds while anyone is subscribed.
+
+    When the revision moves from R to R', `fetch_changes(R)` is called once and its
+    result (a dict with at least a 'revision' key) is handed to every subscriber.
+    A subscriber that already saw revision S joins with `since=S`; the next poll then
+    reports everything after min(R, S), so reconnecting clients miss nothing.
+    """
+
+    def __init__(self, fetch_revision, fetch_changes, interval=1.0, max_subscribers=4, queue_size=32):
+        self.fetch_revision = fetch_revision
+        self.fetch_changes = fetch_changes
+        self.interval = interval
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._floor = None  # lowest `since` of clients that joined since the last poll
+        self._cond = threading.Condition()
+        self._started_pid = None
+
+    def subscribe(self, since=None):
+        """Register a client and return its Subscription; raises TooManySubscribers at the cap."""
+        with self._cond:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise TooManySubscribers()
+            subscription = Subscription(self.queue_size)
+            self._subscribers.add(subscription)
+            if since is not None:
+                self._floor = since if self._floor is None else min(self._floor, since)
+            if self._started_pid != os.getpid():
+                # (Re)start after a fork: threads don't survive into gunicorn workers
+                threading.Thread(target=self._run, name='live-feed', daemon=True).start()
+                self._started_pid = os.getpid()
+            self._cond.notify()
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._cond:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._cond:
+            return len(self._subscribers)
+
+    def _run(self):
+        last = None
+        while True:
+            with self._cond:
+                while not self._subscribers:
+                    last = None  # nobody listening; don't poll, and start fresh next time
+                    self._cond.wait()
+                if self._floor is not None:
+                    last = self._floor if last is None else min(last, self._floor)
+                    self._floor = None
+            try:
+                revision = self.fetch_revision()
+                if last is not None and revision > last:
+                    change = self.fetch_changes(last)
+                    with self._cond:
+                        for subscription in self._subscribers:
+                            subscription._offer(change)
+                last = revision
+            except Exception:
+                log.exception("live feed poll failed")
+            with self._cond:
+                self._cond.wait(timeout=self.interval)
@@ -0,0 +1,176 @@
+"""In-process request metrics, exposed in the Prometheus text format.
+
+Records, per Flask endpoint:
+
+- request latency as a histogram, and a request count by status code;
+- how many SQL statements the endpoint ran and how long they took, from
+  SQLAlchemy cursor events;
+- named spans for work that isn't SQL: template renders (from Flask's
+  template signals), PDF builds and PIN hashing (wrapped with `span()`).
+
+Everything is a few counters and fixed-bucket histograms behind one lock, so the
+cost per request is a handful of dict updates and is fine to leave on. Numbers
+are per worker process, like /cache_stats; `process_start_time_seconds` lets a
+scraper tell a restarted worker from a counter reset.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request, before_render_template, template_rendered
+from sqlalchemy import event
+
+# Seconds; wide enough for a sub-millisecond cache hit and a multi-second PDF build
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_started = time.time()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Counter:
+    """A monotonically increasing value per label combination."""
+
+    def __init__(self, name, help, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values = {}
+
+    def inc(self, labels=(), amount=1):
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with _lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            value = f'{value:.6f}' if isinstance(value, float) else value
+            lines.append(f'{self.name}{_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket latency histogram per label combination."""
+
+    def __init__(self, name, help, labelnames=(), buckets=BUCKETS):
+        self.name, self.help, self.labelnames, self.buckets = name, help, labelnames, buckets
+        self._series = {}  # labels -> [per-bucket counts (+Inf last), sum]
+
+    def observe(self, labels, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with _lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += seconds
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with _lock:
+            items = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, [("le", le)])} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {total:.6f}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+REQUEST_SECONDS = Histogram('http_request_duration_seconds', 'Time to produce a response.', ('endpoint', 'method'))
+REQUESTS = Counter('http_requests_total', 'Responses sent.', ('endpoint', 'method', 'status'))
+SQL_STATEMENTS = Counter('db_statements_total', 'SQL statements executed.', ('endpoint',))
+SQL_SECONDS = Counter('db_statement_seconds_total', 'Time spent executing SQL statements.', ('endpoint',))
+SPAN_SECONDS = Histogram('span_duration_seconds', 'Time spent in named spans (renders, PDF builds, PIN hashing).',
+                         ('span', 'endpoint'))
+
+METRICS = (REQUEST_SECONDS, REQUESTS, SQL_STATEMENTS, SQL_SECONDS, SPAN_SECONDS)
+
+
+def _endpoint():
+    """The current Flask endpoint, or 'background' outside a request (jobs, CLI)."""
+    if has_request_context():
+        return request.endpoint or 'unmatched'
+    return 'background'
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block as span `name` under the current endpoint."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        SPAN_SECONDS.observe((name, _endpoint()), time.perf_counter() - started)
+
+
+def render():
+    """Return every metric in the Prometheus text exposition format."""
+    lines = [
+        '# HELP process_start_time_seconds When this worker process started.',
+        '# TYPE process_start_time_seconds gauge',
+        f'process_start_time_seconds {_started:.3f}',
+    ]
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app, engine):
+    """Hook request timing, template spans and SQL counting into `app` and `engine`."""
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            endpoint = _endpoint()
+            REQUEST_SECONDS.observe((endpoint, request.method), time.perf_counter() - started)
+            REQUESTS.inc((endpoint, request.method, str(response.status_code)))
+        return response
+
+    def _render_started(sender, template, context, **extra):
+        g.setdefault('metrics_renders', []).append(time.perf_counter())
+
+    def _render_finished(sender, template, context, **extra):
+        starts = g.get('metrics_renders')
+        if starts:
+            SPAN_SECONDS.observe((f'render:{template.name}', _endpoint()), time.perf_counter() - starts.pop())
+
+    before_render_template.connect(_render_started, app, weak=False)
+    template_rendered.connect(_render_finished, app, weak=False)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _statement_started(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('metrics_started')
+        if starts:
+            endpoint = (_endpoint(),)
+            SQL_STATEMENTS.inc(endpoint)
+            SQL_SECONDS.inc(endpoint, time.perf_counter() - starts.pop())
+
+    @event.listens_for(engine, 'handle_error')
+    def _statement_failed(context):
+        starts = context.connection.info.get('metrics_started') if context.connection is not None else None
+        if starts:
+            starts.pop()
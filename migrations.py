@@ -0,0 +1,144 @@
+"""Versioned schema migrations, run once per deploy.
+
+    flask --app app migrate
+
+Each migration runs once and is recorded in the `schema_version` table, so
+gunicorn workers boot without issuing any DDL. Every step is written to be safe
+on a database that was built by the old import-time create_all/ALTER TABLE code,
+so existing deployments simply run all of them once.
+
+On PostgreSQL the whole run holds an advisory lock, so two deploys (or a deploy
+and a manual run) never migrate at the same time.
+"""
+import time
+
+from sqlalchemy import Column, Float, Integer, String, Table, inspect
+
+from app import app, db, Order, OrderTombstone, ItemPrice, Config, backfill_order_items, dedupe_orders
+from config import PRICES
+
+schema_version = Table(
+    'schema_version', db.metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', Float, nullable=False),
+)
+
+_ADVISORY_LOCK_ID = 0x46324B  # "F2K"
+
+
+def _create_tables():
+    db.create_all()
+
+
+def _add_legacy_columns():
+    inspector = inspect(db.engine)
+    if 'price_snapshot' not in {c['name'] for c in inspector.get_columns('order')}:
+        db.session.execute(db.text('ALTER TABLE "order" ADD COLUMN price_snapshot TEXT'))
+    if 'pin_hash' not in {c['name'] for c in inspector.get_columns('user')}:
+        db.session.execute(db.text('ALTER TABLE "user" ADD COLUMN pin_hash VARCHAR(256)'))
+    db.session.commit()
+
+
+def _seed_item_prices():
+    if ItemPrice.query.count() == 0:
+        for key, price in PRICES.items():
+            db.session.add(ItemPrice(key=key, price=price))
+        db.session.commit()
+
+
+def _create_indexes(*names):
+    indexes = {index.name: index for index in Order.__table__.indexes}
+    for name in names:
+        indexes[name].create(db.engine, checkfirst=True)
+
+
+def _order_lookup_indexes():
+    # user_id and source lookups are served by indexes that lead with those columns
+    # (uq_order_user_source, ix_order_source_*); status filters get their own
+    _create_indexes('ix_order_source_id', 'ix_order_source_status_id', 'ix_order_status')
+
+
+def _one_order_per_customer():
+    dedupe_orders()
+    _create_indexes('uq_order_user_source')
+
+
+def _order_revisions():
+    if 'revision' not in {c['name'] for c in inspect(db.engine).get_columns('order')}:
+        db.session.execute(db.text('ALTER TABLE "order" ADD COLUMN revision INTEGER NOT NULL DEFAULT 0'))
+        db.session.commit()
+    OrderTombstone.__table__.create(db.engine, checkfirst=True)
+    _create_indexes('ix_order_revision')
+    # Seed the counter so concurrent first bumps update a row instead of racing to insert it
+    if not Config.query.filter_by(key='orders_version').first():
+        db.session.add(Config(key='orders_version', value=0.0))
+        db.session.commit()
+
+
+def _seed_prices_version():
+    # Like orders_version in step 7: /update_prices then always bumps an existing row
+    if not Config.query.filter_by(key='prices_version').first():
+        db.session.add(Config(key='prices_version', value=0.0))
+        db.session.commit()
+
+
+def _tombstone_timestamps():
+    if 'deleted_at' not in {c['name'] for c in inspect(db.engine).get_columns('order_tombstone')}:
+        # Existing tombstones get 0, so the first prune clears them and raises the floor past them
+        db.session.execute(db.text(
+            'ALTER TABLE order_tombstone ADD COLUMN deleted_at FLOAT NOT NULL DEFAULT 0'))
+    if not Config.query.filter_by(key='tombstone_floor').first():
+        db.session.add(Config(key='tombstone_floor', value=0.0))
+    db.session.commit()
+
+
+# (version, description, step). Append only; never renumber or edit a released step.
+MIGRATIONS = [
+    (1, "create tables", _create_tables),
+    (2, "add order.price_snapshot and user.pin_hash", _add_legacy_columns),
+    (3, "seed item prices from config", _seed_item_prices),
+    (4, "order status and dashboard pagination indexes", _order_lookup_indexes),
+    (5, "backfill order line items", backfill_order_items),
+    (6, "dedupe orders; unique order per customer and source", _one_order_per_customer),
+    (7, "order revisions and deletion tombstones for /api/orders", _order_revisions),
+    (8, "seed prices_version", _seed_prices_version),
+    (9, "tombstone deletion times and pruning floor", _tombstone_timestamps),
+]
+
+
+def applied_versions():
+    """Return the set of migration versions already recorded in this database."""
+    schema_version.create(db.engine, checkfirst=True)
+    return set(db.session.execute(db.select(schema_version.c.version)).scalars())
+
+
+def migrate():
+    """Apply pending migrations in order; return [(version, description)] of those applied."""
+    postgres = db.engine.dialect.name == 'postgresql'
+    if postgres:
+        lock = db.engine.connect()
+        lock.execute(db.text('SELECT pg_advisory_lock(:id)'), {'id': _ADVISORY_LOCK_ID})
+    try:
+        done = applied_versions()
+        applied = []
+        for version, description, step in MIGRATIONS:
+            if version in done:
+                continue
+            step()
+            db.session.execute(schema_version.insert().values(
+                version=version, description=description, applied_at=time.time(),
+            ))
+            db.session.commit()
+            applied.append((version, description))
+        return applied
+    finally:
+        if postgres:
+            lock.execute(db.text('SELECT pg_advisory_unlock(:id)'), {'id': _ADVISORY_LOCK_ID})
+            lock.close()
+
+
+if __name__ == '__main__':
+    with app.app_context():
+        for version, description in migrate():
+            print(f"applied {version:>3}  {description}")
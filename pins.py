@@ -0,0 +1,71 @@
+"""Customer PIN hashing and short-lived verified-customer tokens.
+
+PIN hashes use Werkzeug's KDF at a configurable cost and run on a small bounded
+thread pool, so at most PIN_HASH_THREADS hashes burn CPU per worker at once
+(hashlib's pbkdf2 releases the GIL, so other threads keep serving meanwhile).
+
+After a successful check, /submit_order stores a signed token in the session.
+A follow-up submission from the same customer within PIN_TOKEN_MAX_AGE seconds
+is verified against that token with a cheap HMAC instead of the KDF. The token
+is bound to the current pin_hash, so an admin PIN reset invalidates it.
+"""
+import os
+import hmac
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Werkzeug 2.3's default cost; existing hashes carry their own method and keep verifying
+PIN_HASH_METHOD = os.getenv("PIN_HASH_METHOD", "pbkdf2:sha256:600000")
+PIN_HASH_THREADS = int(os.getenv("PIN_HASH_THREADS", 2))
+PIN_TOKEN_MAX_AGE = int(os.getenv("PIN_TOKEN_MAX_AGE", 900))
+
+_pool = ThreadPoolExecutor(max_workers=PIN_HASH_THREADS, thread_name_prefix='pin-hash')
+
+
+def hash_pin(pin):
+    """Return a new hash for `pin`, computed on the bounded KDF pool."""
+    return _pool.submit(generate_password_hash, pin, method=PIN_HASH_METHOD).result()
+
+
+def check_pin(pin_hash, pin):
+    """Return True if `pin` matches `pin_hash`, computed on the bounded KDF pool."""
+    return _pool.submit(check_password_hash, pin_hash, pin).result()
+
+
+def _serializer(secret_key):
+    return URLSafeTimedSerializer(secret_key, salt='pin-verified')
+
+
+def _pin_mac(secret_key, phone, pin):
+    return hmac.new(secret_key.encode(), f"{phone}:{pin}".encode(), hashlib.sha256).hexdigest()
+
+
+def _hash_fingerprint(pin_hash):
+    return hashlib.sha256(pin_hash.encode()).hexdigest()[:16]
+
+
+def issue_token(secret_key, phone, pin, pin_hash):
+    """Return a signed token proving `phone` just verified `pin` against `pin_hash`."""
+    return _serializer(secret_key).dumps({
+        'phone': phone,
+        'pin': _pin_mac(secret_key, phone, pin),
+        'hash': _hash_fingerprint(pin_hash),
+    })
+
+
+def token_verifies(secret_key, token, phone, pin, pin_hash, max_age=PIN_TOKEN_MAX_AGE):
+    """Return True if `token` is fresh and vouches for this phone, PIN and current pin_hash."""
+    if not token or not pin_hash:
+        return False
+    try:
+        data = _serializer(secret_key).loads(token, max_age=max_age)
+    except BadSignature:  # also covers SignatureExpired
+        return False
+    return (
+        data.get('phone') == phone
+        and hmac.compare_digest(data.get('pin', ''), _pin_mac(secret_key, phone, pin))
+        and data.get('hash') == _hash_fingerprint(pin_hash)
+    )
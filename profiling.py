@@ -0,0 +1,143 @@
+"""On-demand cProfile capture for single requests.
+
+A profiled request runs under its own `cProfile.Profile` and is saved as a
+`.prof` file plus a small JSON record of what the request was. Only one request
+per worker process is profiled at a time: from Python 3.12 cProfile hooks
+`sys.monitoring`, which allows a single active profiler per interpreter and
+sees every thread, so a second concurrent profile would fail or mix in the
+other request's calls. A request that asks while another is being profiled
+simply runs unprofiled. Files live in one
+directory shared by every worker and only the newest `keep` are kept, so the
+directory can't grow without bound. The `.prof` files load in pstats, snakeviz
+or any other cProfile viewer.
+"""
+import cProfile
+import itertools
+import json
+import os
+import pstats
+import re
+import sysconfig
+import threading
+import time
+
+_NAME = re.compile(r'^\d+-\d+-[\w.]+$')
+_PREFIXES = sorted(
+    {os.path.join(path, '') for path in [os.path.dirname(os.path.abspath(__file__))]
+     + [sysconfig.get_paths()[key] for key in ('purelib', 'platlib', 'stdlib')]},
+    key=len, reverse=True,
+)
+
+
+class RequestProfiler:
+    """Writes per-request profiles to `profile_dir`, keeping the newest `keep`.
+
+    `sample_every=N` also profiles every Nth request this worker handles
+    (0 turns sampling off).
+    """
+
+    def __init__(self, profile_dir, keep=50, sample_every=0):
+        self.profile_dir = profile_dir
+        self.keep = keep
+        self.sample_every = sample_every
+        self._counter = itertools.count(1)
+        self._busy = threading.Lock()  # held while a request in this process is profiled
+
+    def should_sample(self):
+        return bool(self.sample_every) and next(self._counter) % self.sample_every == 0
+
+    def start(self):
+        """Start profiling the calling thread; None if a profile is already running in this process."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            self._busy.release()
+            return None  # some other profiler (a debugger, an outer cProfile) holds the hook
+        return profile, time.perf_counter()
+
+    def discard(self, started):
+        """Stop the profile from start() without saving it."""
+        profile, _ = started
+        try:
+            profile.disable()
+        finally:
+            self._busy.release()
+
+    def finish(self, started, **info):
+        """Stop the profile from start() and save it with `info`; return the profile's name."""
+        profile, began = started
+        try:
+            profile.disable()
+        finally:
+            self._busy.release()
+        elapsed = time.perf_counter() - began
+        endpoint = re.sub(r'[^\w.]', '_', info.get('endpoint') or 'none')
+        name = f"{time.time_ns() // 1000}-{os.getpid()}-{endpoint}"
+        os.makedirs(self.profile_dir, exist_ok=True)
+        profile.dump_stats(self._path(name, '.prof'))
+        record = dict(info, name=name, created=time.strftime('%Y-%m-%d %H:%M:%S'),
+                      duration_ms=round(elapsed * 1000, 2))
+        with open(self._path(name, '.json'), 'w') as f:
+            json.dump(record, f)
+        self._prune()
+        return name
+
+    def recent(self, limit=20, top=15):
+        """Return the newest `limit` profile records, each with its `top` functions by cumulative time."""
+        records = []
+        for name in self._names()[:limit]:
+            try:
+                with open(self._path(name, '.json')) as f:
+                    record = json.load(f)
+                record['functions'] = self.top_functions(name, top)
+            except (OSError, ValueError, EOFError):
+                continue  # pruned by another worker while we read
+            records.append(record)
+        return records
+
+    def top_functions(self, name, top=15):
+        """Return [(ncalls, tottime, cumtime, 'file:line(function)')] sorted by cumulative time."""
+        stats = pstats.Stats(self._path(name, '.prof')).stats
+        rows = sorted(stats.items(), key=lambda item: -item[1][3])[:top]
+        return [
+            (ncalls, tottime, cumtime, f"{self._short(filename)}:{line}({function})")
+            for (filename, line, function), (_, ncalls, tottime, cumtime, _) in rows
+        ]
+
+    def path(self, name):
+        """Return the .prof file for `name`, or None if it isn't a profile name or is gone."""
+        if not _NAME.match(name):
+            return None
+        path = self._path(name, '.prof')
+        return path if os.path.exists(path) else None
+
+    def _path(self, name, suffix):
+        return os.path.join(self.profile_dir, name + suffix)
+
+    def _names(self):
+        """Profile names, newest first (names start with a microsecond timestamp)."""
+        try:
+            files = os.listdir(self.profile_dir)
+        except FileNotFoundError:
+            return []
+        names = [f[:-5] for f in files if f.endswith('.prof') and _NAME.match(f[:-5])]
+        return sorted(names, key=lambda n: int(n.split('-', 1)[0]), reverse=True)
+
+    def _prune(self):
+        for name in self._names()[self.keep:]:
+            for suffix in ('.prof', '.json'):
+                try:
+                    os.remove(self._path(name, suffix))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _short(filename):
+        # Show paths relative to the app, site-packages or the stdlib so the listing stays readable
+        for prefix in _PREFIXES:
+            if filename.startswith(prefix):
+                return filename[len(prefix):]
+        return filename
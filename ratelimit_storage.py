@@ -0,0 +1,116 @@
+"""SQLite rate-limit storage for flask-limiter, shared by every worker on the host.
+
+flask-limiter's default in-memory storage keeps separate counters in each gunicorn
+worker, so "5 per minute" really allows 5 x workers. This backend keeps fixed-window
+counters in one small SQLite file in WAL mode instead: each hit is a single atomic
+upsert, so workers on the same host share their counts without a Redis/Memcached
+service.
+
+Importing this module registers the ``sqlite://`` scheme with the `limits` package:
+
+    RATELIMIT_STORAGE_URI=sqlite:////path/to/ratelimit.db
+
+Expired counters are swept at most every `sweep_interval` seconds, and the table is
+capped at `max_keys` rows (the soonest-expiring counters go first), so the file stays
+small however many distinct phones or IPs show up.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import Storage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counter (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_counter_expires ON counter (expires);
+"""
+
+# One statement: start a new window if the old one expired, otherwise add to it
+_INCR = """
+INSERT INTO counter (key, value, expires) VALUES (:key, :amount, :expires)
+ON CONFLICT (key) DO UPDATE SET
+    value = CASE WHEN counter.expires <= :now THEN excluded.value ELSE counter.value + excluded.value END,
+    expires = CASE WHEN counter.expires <= :now OR :elastic THEN excluded.expires ELSE counter.expires END
+RETURNING value
+"""
+
+
+class SQLiteStorage(Storage):
+    """Fixed-window counters in a local SQLite file (``sqlite:///relative`` or ``sqlite:////absolute``)."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri, wrap_exceptions=False, max_keys=100_000, sweep_interval=60, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri.split("://", 1)[1][1:] or ":memory:"
+        self.max_keys = int(max_keys)
+        self.sweep_interval = float(sweep_interval)
+        self._local = threading.local()
+        self._next_sweep = 0.0
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conn(self):
+        # One connection per thread (and per process: a forked worker's pid differs)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # counters needn't survive power loss
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        now = time.time()
+        value = self._conn().execute(_INCR, {
+            "key": key, "amount": amount, "expires": now + expiry, "now": now, "elastic": elastic_expiry,
+        }).fetchone()[0]
+        if now >= self._next_sweep:
+            self._sweep(now)
+        return value
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM counter WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT expires FROM counter WHERE key = ? AND expires > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            self._conn().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._conn().execute("DELETE FROM counter").rowcount
+
+    def clear(self, key):
+        self._conn().execute("DELETE FROM counter WHERE key = ?", (key,))
+
+    def _sweep(self, now):
+        self._next_sweep = now + self.sweep_interval
+        conn = self._conn()
+        conn.execute("DELETE FROM counter WHERE expires <= ?", (now,))
+        excess = conn.execute("SELECT COUNT(*) FROM counter").fetchone()[0] - self.max_keys
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM counter WHERE key IN (SELECT key FROM counter ORDER BY expires LIMIT ?)", (excess,)
+            )
@@ -0,0 +1,444 @@
+"""PDF rendering for Farm2Kitchen Halal reports.
+
+Functions here take plain data (dicts / tuples) and never touch the database,
+so they can be called from request handlers, CLI scripts or worker processes.
+"""
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import portrait, landscape, A4, letter
+from reportlab.lib import colors
+from reportlab.lib.units import cm, inch
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.enums import TA_CENTER
+
+HEADER_BG = colors.HexColor("#1a472a")
+ALT       = colors.HexColor("#f4f4f4")
+WHITE     = colors.white
+TOTAL_BG  = colors.HexColor("#e8f5e9")
+GRID      = colors.HexColor("#cccccc")
+
+title_style = ParagraphStyle("title", fontSize=15, fontName="Helvetica-Bold",
+                             alignment=TA_CENTER, spaceAfter=4)
+sub_style   = ParagraphStyle("sub",   fontSize=9,  fontName="Helvetica",
+                             alignment=TA_CENTER, spaceAfter=14,
+                             textColor=colors.HexColor("#555555"))
+tight_sub_style = ParagraphStyle("sub_tight", parent=sub_style, spaceAfter=10)
+
+CREDIT_COLOR = colors.HexColor("#888888")
+OWED_COLOR   = colors.HexColor("#c0392b")
+cell_style   = ParagraphStyle("cell",  fontSize=7.5, fontName="Helvetica", leading=10)
+credit_style = ParagraphStyle("credit", fontSize=7.5, fontName="Helvetica-Oblique",
+                              leading=10, textColor=CREDIT_COLOR)
+owed_style   = ParagraphStyle("owed",  fontSize=7.5, fontName="Helvetica-Bold",
+                              leading=10, textColor=OWED_COLOR)
+
+# Report snapshots (see generate_reports.py) carry orders as compact tuples in FCFS order:
+# (rank, order_id, name, phone, items, total, paid, status)
+
+
+def plain_label(label):
+    """Drop the leading emoji from a config.LABELS entry; the built-in PDF fonts can't draw it."""
+    first, _, rest = label.partition(" ")
+    return rest if rest and not first.isascii() else label
+
+
+def short_items(lines, labels, units):
+    """Format [(item_key, quantity), ...] the way the printed reports list items, e.g. "Goat 10 lb, Rooster ×2"."""
+    parts = []
+    for key, qty in lines:
+        label = plain_label(labels.get(key, key))
+        unit = units.get(key, "each")
+        if unit == "each":
+            parts.append(f"{label} ×{qty:g}")
+        else:
+            parts.append(f"{label} {qty:g} {'doz' if unit == 'dozen' else unit}")
+    return ", ".join(parts) or "No items"
+
+
+FCFS_HEADER = ["Rank", "Customer", "Phone", "Items Ordered", "Total"]
+FCFS_COL_WIDTHS = [1.1*cm, 5.8*cm, 3.0*cm, 15.5*cm, 2.0*cm]
+FCFS_STYLE = TableStyle([
+    # Header
+    ("BACKGROUND",   (0,0), (-1,0), HEADER_BG),
+    ("TEXTCOLOR",    (0,0), (-1,0), colors.white),
+    ("FONTNAME",     (0,0), (-1,0), "Helvetica-Bold"),
+    ("FONTSIZE",     (0,0), (-1,0), 9),
+    ("ALIGN",        (0,0), (-1,0), "CENTER"),
+    ("VALIGN",       (0,0), (-1,-1), "MIDDLE"),
+    ("ROWBACKGROUNDS", (0,1), (-1,-1), [WHITE, ALT]),
+    ("FONTSIZE",     (0,1), (-1,-1), 8),
+    ("ALIGN",        (0,1), (-1,-1), "CENTER"),
+    ("ALIGN",        (3,1), (3,-1), "LEFT"),
+    ("ALIGN",        (1,1), (1,-1), "LEFT"),
+    ("GRID",         (0,0), (-1,-1), 0.4, GRID),
+    ("TOPPADDING",   (0,0), (-1,-1), 5),
+    ("BOTTOMPADDING",(0,0), (-1,-1), 5),
+    ("LEFTPADDING",  (0,0), (-1,-1), 5),
+    ("RIGHTPADDING", (0,0), (-1,-1), 5),
+])
+FCFS_TOTALS_STYLE = TableStyle([
+    ("LINEABOVE",    (0,0), (-1,0), 1.5, HEADER_BG),
+    ("BACKGROUND",   (0,0), (-1,0), TOTAL_BG),
+    ("FONTNAME",     (0,0), (-1,0), "Helvetica-Bold"),
+    ("FONTSIZE",     (0,0), (-1,0), 8),
+    ("VALIGN",       (0,0), (-1,0), "MIDDLE"),
+    ("ALIGN",        (0,0), (-1,0), "CENTER"),
+    ("ALIGN",        (1,0), (1,0), "LEFT"),
+    ("TOPPADDING",   (0,0), (-1,-1), 5),
+    ("BOTTOMPADDING",(0,0), (-1,-1), 5),
+    ("LEFTPADDING",  (0,0), (-1,-1), 5),
+    ("RIGHTPADDING", (0,0), (-1,-1), 5),
+])
+
+
+def render_fcfs_pdf(snapshot, output):
+    """Render the FCFS Order Priority Report: every order ranked by submission order."""
+    orders = snapshot["orders"]
+    total_value = sum(r[5] for r in orders)
+
+    c = canvas.Canvas(output, pagesize=landscape(A4))
+    stream = _TableStream(c, landscape(A4), _LANDSCAPE_MARGINS, FCFS_HEADER, FCFS_COL_WIDTHS, FCFS_STYLE)
+    status = "Orders open" if snapshot["orders_open"] else "Orders closed"
+    stream.place(Paragraph("Farm2Kitchen Halal — FCFS Order Priority Report", title_style))
+    stream.place(Paragraph(f"Generated: {snapshot['generated']} &nbsp;|&nbsp; {status}"
+                           f" &nbsp;|&nbsp; Total orders: {len(orders)}", tight_sub_style))
+
+    for rank, oid, name, phone, items, total, paid, status in orders:
+        stream.add([
+            str(rank),
+            _OnceParagraph(escape(name), cell_style),
+            phone,
+            _OnceParagraph(escape(items), cell_style),
+            f"${total:,.2f}",
+        ])
+    stream.finish()
+
+    totals = Table([["", Paragraph("<b>TOTALS</b>", cell_style), "", "", f"${total_value:,.2f}"]],
+                   colWidths=FCFS_COL_WIDTHS)
+    totals.setStyle(FCFS_TOTALS_STYLE)
+    stream.place(totals, space_before=10)
+    c.showPage()
+    c.save()
+
+
+SNAPSHOT_HEADER = ["Rank", "Customer", "Phone", "Items Ordered",
+                   "Order Total", "Shared Cost", "Adj. Total", "Paid", "Remaining Due", "Status"]
+# Col widths: total ~27.1cm (fits in landscape A4 with 1.2cm margins each side)
+SNAPSHOT_COL_WIDTHS = [0.8*cm, 4.1*cm, 2.7*cm, 8.3*cm, 1.9*cm, 1.9*cm, 1.9*cm, 1.9*cm, 2.2*cm, 2.0*cm]
+SNAPSHOT_STYLE = TableStyle([
+    # Header
+    ("BACKGROUND",    (0, 0), (-1, 0), HEADER_BG),
+    ("TEXTCOLOR",     (0, 0), (-1, 0), colors.white),
+    ("FONTNAME",      (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE",      (0, 0), (-1, 0), 8.5),
+    ("ALIGN",         (0, 0), (-1, 0), "CENTER"),
+    # Data rows
+    ("ROWBACKGROUNDS",(0, 1), (-1, -1), [WHITE, ALT]),
+    ("FONTSIZE",      (0, 1), (-1, -1), 7.5),
+    ("VALIGN",        (0, 0), (-1, -1), "MIDDLE"),
+    ("ALIGN",         (0, 1), (-1, -1), "CENTER"),
+    ("ALIGN",         (1, 1), (1, -1), "LEFT"),   # Customer
+    ("ALIGN",         (3, 1), (3, -1), "LEFT"),   # Items
+    ("ALIGN",         (4, 1), (8, -1), "RIGHT"),  # Numeric cols
+    ("GRID",          (0, 0), (-1, -1), 0.4, GRID),
+    ("TOPPADDING",    (0, 0), (-1, -1), 5),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+    ("LEFTPADDING",   (0, 0), (-1, -1), 5),
+    ("RIGHTPADDING",  (0, 0), (-1, -1), 5),
+])
+SNAPSHOT_TOTALS_STYLE = TableStyle([
+    ("LINEABOVE",     (0, 0), (-1, 0), 1.5, HEADER_BG),
+    ("BACKGROUND",    (0, 0), (-1, 0), TOTAL_BG),
+    ("FONTNAME",      (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE",      (0, 0), (-1, 0), 7.5),
+    ("VALIGN",        (0, 0), (-1, 0), "MIDDLE"),
+    ("ALIGN",         (0, 0), (-1, 0), "CENTER"),
+    ("ALIGN",         (1, 0), (1, 0), "LEFT"),
+    ("ALIGN",         (4, 0), (8, 0), "RIGHT"),
+    ("TOPPADDING",    (0, 0), (-1, -1), 5),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+    ("LEFTPADDING",   (0, 0), (-1, -1), 5),
+    ("RIGHTPADDING",  (0, 0), (-1, -1), 5),
+])
+
+
+def render_dashboard_snapshot_pdf(snapshot, output):
+    """Render the Orders Dashboard Snapshot: totals, shared cost split and balances per order."""
+    orders = snapshot["orders"]
+    shared_cost_pool = snapshot["shared_cost"]
+    num_orders = len(orders)
+    shared_per_order = shared_cost_pool / num_orders if num_orders else 0.0
+    confirmed = sum(1 for r in orders if r[7] == "Confirmed")
+
+    grand_order_total = sum(r[5] for r in orders)
+    grand_paid        = sum(r[6] for r in orders)
+    grand_adj_total   = grand_order_total + (shared_cost_pool if num_orders else 0.0)
+    net_remaining     = grand_adj_total - grand_paid
+    status_summary = "All Confirmed" if confirmed == num_orders else f"{confirmed} Confirmed"
+    net_label = f"Net Credit: –${abs(net_remaining):,.2f}" if net_remaining <= 0 else f"Net Due: ${net_remaining:,.2f}"
+
+    c = canvas.Canvas(output, pagesize=landscape(A4))
+    stream = _TableStream(c, landscape(A4), _LANDSCAPE_MARGINS, SNAPSHOT_HEADER, SNAPSHOT_COL_WIDTHS,
+                          SNAPSHOT_STYLE)
+    stream.place(Paragraph("Farm2Kitchen Halal — Orders Dashboard Snapshot", title_style))
+    stream.place(Paragraph(
+        f"Generated: {snapshot['generated']} &nbsp;|&nbsp; {num_orders} Orders &nbsp;|&nbsp; {status_summary}"
+        f" &nbsp;|&nbsp; Order Total: ${grand_order_total:,.2f}"
+        f" &nbsp;|&nbsp; Shared Cost Pool: ${shared_cost_pool:,.2f}"
+        f" &nbsp;|&nbsp; Adj. Total: ${grand_adj_total:,.2f}"
+        f" &nbsp;|&nbsp; Collected: ${grand_paid:,.2f}"
+        f" &nbsp;|&nbsp; {net_label}",
+        tight_sub_style
+    ))
+
+    for rank, oid, name, phone, items, total, paid, status in orders:
+        adj_total = total + shared_per_order
+        remaining = adj_total - paid
+
+        if remaining > 0.005:
+            rem_cell = _OnceParagraph(f"${remaining:,.2f}", owed_style)
+        else:
+            rem_cell = _OnceParagraph(f"–${abs(remaining):,.2f}", credit_style)
+
+        stream.add([
+            str(rank),
+            _OnceParagraph(escape(name), cell_style),
+            phone,
+            _OnceParagraph(escape(items), cell_style),
+            f"${total:,.2f}",
+            f"${shared_per_order:,.2f}",
+            f"${adj_total:,.2f}",
+            f"${paid:,.2f}",
+            rem_cell,
+            status,
+        ])
+    stream.finish()
+
+    net_cell = (
+        Paragraph(f"<b>–${abs(net_remaining):,.2f}</b>", credit_style)
+        if net_remaining <= 0
+        else Paragraph(f"<b>${net_remaining:,.2f}</b>", owed_style)
+    )
+    totals = Table([[
+        "",
+        Paragraph(f"<b>TOTALS — {num_orders} Orders | {status_summary}</b>", cell_style),
+        "", "",
+        f"${grand_order_total:,.2f}",
+        f"${shared_cost_pool:,.2f}",
+        f"${grand_adj_total:,.2f}",
+        f"${grand_paid:,.2f}",
+        net_cell,
+        "",
+    ]], colWidths=SNAPSHOT_COL_WIDTHS)
+    totals.setStyle(SNAPSHOT_TOTALS_STYLE)
+    stream.place(totals, space_before=10)
+    c.showPage()
+    c.save()
+
+
+def render_item_demand_pdf(demand, output):
+    """Render the Item Demand Breakdown PDF.
+
+    `demand` is the dict returned by app.get_item_demand(); `output` is a path or file object.
+    """
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=portrait(A4),
+        leftMargin=2.0*cm, rightMargin=2.0*cm,
+        topMargin=2.0*cm, bottomMargin=2.0*cm,
+    )
+
+    header = ["Item", "Total Qty", "Unit", "Unit Price", "Subtotal"]
+    table_data = [header]
+    for item in demand["items"]:
+        qty = item["quantity"]
+        table_data.append([
+            plain_label(item["label"]),
+            f"{qty:g}",
+            item["unit"],
+            f"${item['unit_price']:,.2f}",
+            f"${item['subtotal']:,.2f}",
+        ])
+
+    # Spacer row then grand total
+    table_data.append(["", "", "", "", ""])
+    table_data.append(["GRAND TOTAL", "", "", "", f"${demand['grand_total']:,.2f}"])
+
+    col_widths = [7.5*cm, 2.5*cm, 2.5*cm, 3.0*cm, 3.0*cm]
+
+    style = TableStyle([
+        # Header
+        ("BACKGROUND",    (0, 0), (-1, 0), HEADER_BG),
+        ("TEXTCOLOR",     (0, 0), (-1, 0), colors.white),
+        ("FONTNAME",      (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE",      (0, 0), (-1, 0), 10),
+        ("ALIGN",         (0, 0), (-1, 0), "CENTER"),
+        # Data rows
+        ("ROWBACKGROUNDS",(0, 1), (-1, -3), [WHITE, ALT]),
+        ("FONTSIZE",      (0, 1), (-1, -1), 9),
+        ("VALIGN",        (0, 0), (-1, -1), "MIDDLE"),
+        ("ALIGN",         (0, 1), (0, -1), "LEFT"),
+        ("ALIGN",         (1, 1), (-1, -1), "CENTER"),
+        ("ALIGN",         (4, 1), (4, -1), "RIGHT"),
+        ("ALIGN",         (3, 1), (3, -1), "RIGHT"),
+        ("GRID",          (0, 0), (-1, -3), 0.4, GRID),
+        ("TOPPADDING",    (0, 0), (-1, -1), 7),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 7),
+        ("LEFTPADDING",   (0, 0), (-1, -1), 8),
+        ("RIGHTPADDING",  (0, 0), (-1, -1), 8),
+        # Grand total row
+        ("LINEABOVE",     (0, -1), (-1, -1), 1.5, HEADER_BG),
+        ("BACKGROUND",    (0, -1), (-1, -1), TOTAL_BG),
+        ("FONTNAME",      (0, -1), (-1, -1), "Helvetica-Bold"),
+        ("FONTSIZE",      (0, -1), (-1, -1), 10),
+        ("SPAN",          (0, -1), (3, -1)),
+        ("ALIGN",         (0, -1), (3, -1), "RIGHT"),
+        ("SPAN",          (0, -2), (-1, -2)),
+    ])
+
+    t = Table(table_data, colWidths=col_widths, repeatRows=1)
+    t.setStyle(style)
+
+    num_orders = demand["num_orders"]
+    elements = [
+        Paragraph("Farm2Kitchen Halal — Item Demand Breakdown", title_style),
+        Paragraph(f"Generated: {demand['generated']} &nbsp;|&nbsp; {num_orders} order{'' if num_orders == 1 else 's'}"
+                  f" &nbsp;|&nbsp; Grand Total: ${demand['grand_total']:,.2f}", sub_style),
+        t,
+    ]
+    doc.build(elements)
+
+
+CONFIRMED_HEADER = ["Name", "Phone", "Items Ordered", "Total", "Amt Paid", "Remaining"]
+CONFIRMED_COL_WIDTHS = [90, 80, 130, 60, 60, 58]
+CONFIRMED_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#f0f0f0")),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 6),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+class _OnceParagraph(Paragraph):
+    """Paragraph that remembers its last wrap; table splitting re-measures cells many times."""
+    _wrapped_for = None
+
+    def wrap(self, availWidth, availHeight):
+        if self._wrapped_for != availWidth:
+            super().wrap(availWidth, availHeight)
+            self._wrapped_for = availWidth
+        return self.width, self.height
+
+
+# Buffered rows are laid out every LAYOUT_CHUNK rows; full pages are drawn and released,
+# so only the rows still waiting for a page are held in memory and a table split never
+# measures more than about a page of rows (one Table over every row is quadratic).
+LAYOUT_CHUNK = 25
+_LANDSCAPE_MARGINS = (1.2*cm, 1.2*cm, 1.5*cm, 1.5*cm)  # left, right, top, bottom
+
+
+class _TableStream:
+    """Draws table rows onto a canvas page by page as they arrive.
+
+    Every page gets the header row and `style`; `place()` draws any other flowable
+    (titles, a totals table) at the current position, starting a new page if needed.
+    """
+
+    def __init__(self, c, pagesize, margins, header, col_widths, style):
+        left, right, top, bottom = margins
+        page_width, page_height = pagesize
+        self.c = c
+        self.x, self.width = left, page_width - left - right
+        self.top, self.bottom = page_height - top, bottom
+        self.y = self.top
+        self.header, self.col_widths, self.style = header, col_widths, style
+        self.pending = []
+        self._flush_at = LAYOUT_CHUNK
+
+    def place(self, flowable, space_before=0):
+        """Draw `flowable` below what is already on the page."""
+        _, height = flowable.wrap(self.width, self.top - self.bottom)
+        y = self.y - space_before
+        if height > y - self.bottom and self.y != self.top:
+            self._new_page()
+            y = self.y
+        flowable.drawOn(self.c, self.x, y - height)
+        self.y = y - height - flowable.getSpaceAfter()
+
+    def add(self, row):
+        self.pending.append(row)
+        if len(self.pending) >= self._flush_at:
+            self._draw(final=False)
+            self._flush_at = len(self.pending) + LAYOUT_CHUNK
+
+    def finish(self):
+        """Draw every row still buffered."""
+        self._draw(final=True)
+
+    def _table(self, rows):
+        table = Table([self.header] + rows, colWidths=self.col_widths, repeatRows=1)
+        table.setStyle(self.style)
+        return table
+
+    def _new_page(self):
+        self.c.showPage()
+        self.y = self.top
+
+    def _draw(self, final):
+        while self.pending:
+            avail = self.y - self.bottom
+            table = self._table(self.pending)
+            _, height = table.wrap(self.width, avail)
+            if height <= avail:
+                if not final:
+                    return  # page not full yet; wait for more rows
+                table.drawOn(self.c, self.x, self.y - height)
+                self.pending = []
+                self.y -= height
+                return
+            parts = table.split(self.width, avail)
+            if not parts and self.y == self.top:
+                parts = [self._table(self.pending[:1])]  # a single row taller than a page; let it overflow
+            if parts:
+                first = parts[0]
+                _, first_height = first.wrap(self.width, avail)
+                first.drawOn(self.c, self.x, self.y - first_height)
+                self.pending = self.pending[len(first._cellvalues) - 1:]
+            self._new_page()
+
+
+def render_confirmed_orders_pdf(rows, output):
+    """Render the Confirmed Orders Summary one page at a time.
+
+    `rows` is any iterable of (name, phone, items_ordered, total, amount_paid) tuples, e.g. a
+    batched DB cursor; `output` is a path or writable binary file. Unlike a platypus story,
+    finished pages are drawn and released as rows arrive, so memory stays flat as the
+    number of orders grows.
+    """
+    styles = getSampleStyleSheet()
+    c = canvas.Canvas(output, pagesize=letter)
+    stream = _TableStream(c, letter, (inch, inch, inch, inch), CONFIRMED_HEADER,
+                          CONFIRMED_COL_WIDTHS, CONFIRMED_STYLE)
+    title = Paragraph("Confirmed Orders Summary", styles['Title'])
+    stream.place(title)
+    stream.y -= 12
+
+    for name, phone, items_ordered, total, amount_paid in rows:
+        amount_paid = amount_paid or 0.0
+        stream.add([
+            name,
+            phone,
+            _OnceParagraph(items_ordered.replace(", ", "<br/>"), styles['Normal']),
+            f"${total:.2f}",
+            f"${amount_paid:.2f}",
+            f"${total - amount_paid:.2f}",
+        ])
+    stream.finish()
+    c.showPage()
+    c.save()
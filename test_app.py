@@ -7,6 +7,7 @@ Usage:
     pytest test_app.py -v
 """
 import os
+import functools
 import tempfile
 
 # Set required env vars BEFORE importing app (config.py raises if unset)
@@ -14,9 +15,13 @@ os.environ.setdefault('SECRET_KEY', 'test-secret-key-do-not-use-in-prod')
 os.environ.setdefault('ADMIN_PASSWORD', 'testpass123')
 os.environ.setdefault('ADMIN_PHONES', '5551234567')
 os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+os.environ.setdefault('PIN_HASH_METHOD', 'pbkdf2:sha256:1000')  # keep the KDF cheap in tests
+os.environ.setdefault('RATELIMIT_STORAGE_URI', 'memory://')  # per-run counters, not instance/ratelimit.db
 
 import pytest
-from app import app as flask_app, db, User, Order, Config, ItemPrice
+from flask import request, request_started, request_finished
+from sqlalchemy import event
+from app import app as flask_app, db, User, Order, OrderItem, Config, ItemPrice, invalidate_settings, reset_caches, report_jobs, intake_journal
 from config import PRICES
 
 
@@ -24,12 +29,15 @@ from config import PRICES
 def client():
     """Fresh isolated SQLite DB for each test."""
     db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    report_dir = tempfile.TemporaryDirectory()
     flask_app.config.update({
         'TESTING': True,
         'WTF_CSRF_ENABLED': False,
         'RATELIMIT_ENABLED': False,
         'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'REPORT_CACHE_DIR': report_dir.name,
     })
+    report_jobs.job_dir = os.path.join(report_dir.name, 'jobs')
 
     with flask_app.app_context():
         db.create_all()
@@ -38,6 +46,7 @@ def client():
             if not ItemPrice.query.filter_by(key=key).first():
                 db.session.add(ItemPrice(key=key, price=price))
         db.session.commit()
+        reset_caches()
 
         yield flask_app.test_client()
 
@@ -46,6 +55,7 @@ def client():
 
     os.close(db_fd)
     os.unlink(db_path)
+    report_dir.cleanup()
 
 
 def _submit_order(client, phone='5550001111', pin='1234', qty=2):
@@ -90,6 +100,20 @@ def test_returning_user_wrong_pin_returns_403(client):
     assert rv.status_code == 403
 
 
+def test_pin_token_skips_kdf_on_follow_up_submit(client, monkeypatch):
+    import pins
+    _submit_order(client, phone='5550009003', pin='1234', qty=1)
+    monkeypatch.setattr(pins, 'check_password_hash', lambda *a: pytest.fail('KDF ran despite token'))
+    rv = _submit_order(client, phone='5550009003', pin='1234', qty=4)
+    assert rv.status_code == 200
+
+
+def test_pin_token_does_not_vouch_for_wrong_pin(client):
+    _submit_order(client, phone='5550009004', pin='1234')
+    rv = _submit_order(client, phone='5550009004', pin='9999')
+    assert rv.status_code == 403
+
+
 def test_invalid_phone_returns_400(client):
     rv = client.post('/submit_order', data={
         'zelle_name': 'Test',
@@ -110,6 +134,45 @@ def test_invalid_pin_returns_400(client):
     assert rv.status_code == 400
 
 
+# ── Database engine profile ───────────────────────────────────────────────────
+
+def test_engine_profile_per_backend(tmp_path):
+    import db_profile
+    from sqlalchemy import create_engine, text
+    assert db_profile.engine_options('sqlite:///:memory:') == {}
+    pg = db_profile.engine_options('postgresql://u:p@localhost/orders')
+    assert pg['pool_pre_ping'] and pg['pool_recycle'] == db_profile.POOL_RECYCLE
+
+    uri = f'sqlite:///{tmp_path}/orders.db'
+    engine = create_engine(uri, **db_profile.engine_options(uri))
+    db_profile.install(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert conn.execute(text('PRAGMA busy_timeout')).scalar() == db_profile.SQLITE_BUSY_TIMEOUT_MS
+    assert engine.pool.size() == db_profile.POOL_SIZE
+    engine.dispose()
+
+
+# ── Rate-limit storage ────────────────────────────────────────────────────────
+
+def test_sqlite_ratelimit_storage_is_shared_and_swept(tmp_path):
+    from limits import parse
+    from limits.strategies import FixedWindowRateLimiter
+    from ratelimit_storage import SQLiteStorage
+    uri = f'sqlite:///{tmp_path}/ratelimit.db'
+    worker_a, worker_b = SQLiteStorage(uri), SQLiteStorage(uri, max_keys=2, sweep_interval=0)
+    five_per_minute = parse('5 per minute')
+    hits = [FixedWindowRateLimiter(w).hit(five_per_minute, 'phone', '5550060001')
+            for w in (worker_a, worker_b) * 3]
+    assert hits == [True] * 5 + [False]  # both "workers" count against one limit
+
+    for i in range(4):
+        worker_b.incr(f'key{i}', expiry=60)
+    assert worker_a._conn().execute('SELECT COUNT(*) FROM counter').fetchone()[0] == 2
+    worker_a.incr('short', expiry=-1)  # already expired
+    assert worker_a.get('short') == 0
+
+
 # ── CSRF protection ───────────────────────────────────────────────────────────
 
 def test_csrf_rejects_post_without_token(client):
@@ -135,6 +198,14 @@ def test_admin_login_correct_credentials(client):
     assert rv.location == '/dashboard'
 
 
+def test_admin_login_accepts_precomputed_hash(client, monkeypatch):
+    import app as app_module
+    from werkzeug.security import generate_password_hash
+    monkeypatch.setattr(app_module, '_admin_password_hash', generate_password_hash('from-env-hash'))
+    rv = client.post('/admin_login', data={'phone': '5551234567', 'password': 'from-env-hash'})
+    assert rv.status_code == 302
+
+
 def test_admin_login_wrong_password_returns_403(client):
     rv = client.post('/admin_login', data={
         'phone': '5551234567',
@@ -195,6 +266,7 @@ def test_shared_cost_divides_by_confirmed_orders_only(client):
         # Set shared cost
         db.session.add(Config(key='shared_cost', value=20.0))
         db.session.commit()
+        invalidate_settings()
 
     with client.session_transaction() as sess:
         sess['admin'] = True
@@ -207,6 +279,20 @@ def test_shared_cost_divides_by_confirmed_orders_only(client):
 
 # ── PDF export ────────────────────────────────────────────────────────────────
 
+def _get_report(client, url, **kwargs):
+    """GET a report URL; on a cache miss (202) wait for the render job, then GET it again."""
+    import time
+    rv = client.get(url, **kwargs)
+    if rv.status_code != 202:
+        return rv
+    job, deadline = rv.get_json(), time.time() + 30
+    while job['status'] in ('queued', 'running') and time.time() < deadline:
+        time.sleep(0.05)
+        job = client.get(job['status_url']).get_json()
+    assert job['status'] == 'done'
+    return client.get(url, **kwargs)
+
+
 def test_pdf_export_includes_amount_paid(client):
     _submit_order(client, phone='5550020001', pin='1234')
 
@@ -219,9 +305,918 @@ def test_pdf_export_includes_amount_paid(client):
     with client.session_transaction() as sess:
         sess['admin'] = True
 
-    rv = client.get('/export_confirmed_pdf')
+    rv = _get_report(client, '/export_confirmed_pdf')
     assert rv.status_code == 200
     assert rv.content_type == 'application/pdf'
     # PDF is compressed — just verify it's a valid non-empty PDF file
     assert rv.data.startswith(b'%PDF')
     assert len(rv.data) > 500
+
+
+def test_pdf_export_etag_and_invalidation(client):
+    _submit_order(client, phone='5550020002', pin='1234')
+    _submit_order(client, phone='5550020003', pin='1234')
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    with flask_app.app_context():
+        first_id, second_id = [o.id for o in Order.query.order_by(Order.id)]
+    client.post(f'/confirm_order/{first_id}')
+
+    rv = _get_report(client, '/export_confirmed_pdf')
+    etag = rv.headers['ETag']
+    assert rv.status_code == 200 and not etag.startswith('W/')
+    assert len([f for f in os.listdir(flask_app.config['REPORT_CACHE_DIR']) if f.endswith('.pdf')]) == 1
+
+    rv = client.get('/export_confirmed_pdf', headers={'If-None-Match': etag})
+    assert rv.status_code == 304
+
+    client.post(f'/confirm_order/{second_id}')
+    rv = _get_report(client, '/export_confirmed_pdf', headers={'If-None-Match': etag})
+    assert rv.status_code == 200
+    assert rv.headers['ETag'] != etag
+    # The superseded PDF is pruned from the cache
+    assert len([f for f in os.listdir(flask_app.config['REPORT_CACHE_DIR']) if f.endswith('.pdf')]) == 1
+
+
+def test_late_render_of_older_version_keeps_newer_report(client):
+    from app import cached_report_path
+    cache_dir = flask_app.config['REPORT_CACHE_DIR']
+    older, newer = '3-' + 'a' * 64, '4-' + 'b' * 64
+    with flask_app.app_context():
+        cached_report_path('item_demand', newer)
+        # A slow render of the previous version finishing second must not prune the newer file
+        cached_report_path('item_demand', older)
+        assert sorted(os.listdir(cache_dir)) == [f'item_demand-{older}.pdf', f'item_demand-{newer}.pdf']
+        os.remove(os.path.join(cache_dir, f'item_demand-{newer}.pdf'))
+        cached_report_path('item_demand', newer)
+    assert os.listdir(cache_dir) == [f'item_demand-{newer}.pdf']
+
+
+def test_report_job_runs_in_background_and_downloads(client):
+    import time
+    _submit_order(client, phone='5550020004', pin='1234')
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+
+    rv = client.post('/jobs', data={'report': 'item_demand'})
+    assert rv.status_code == 202
+    job = rv.get_json()
+    deadline = time.time() + 30
+    while job['status'] in ('queued', 'running') and time.time() < deadline:
+        time.sleep(0.05)
+        job = client.get(job['status_url']).get_json()
+    assert job['status'] == 'done'
+
+    rv = client.get(job['download_url'])
+    assert rv.status_code == 200
+    assert rv.data.startswith(b'%PDF')
+
+    # Already rendered for this orders version: the next job is done immediately
+    assert client.post('/jobs', data={'report': 'item_demand'}).get_json()['status'] == 'done'
+
+
+def test_report_jobs_require_admin_and_known_report(client):
+    assert client.post('/jobs', data={'report': 'item_demand'}).status_code == 403
+    assert client.get('/jobs/' + '0' * 32).status_code == 403
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    assert client.post('/jobs', data={'report': 'nope'}).status_code == 400
+    assert client.get('/jobs/' + '0' * 32).status_code == 404
+    assert client.get('/jobs/../etc').status_code == 404
+
+
+def test_busy_report_pool_answers_503_without_direct_fallback(client, monkeypatch):
+    from jobs import QueueFull
+    def full(*args, **kwargs):
+        raise QueueFull()
+    monkeypatch.setattr(report_jobs, 'submit', full)
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    rv = client.post('/jobs', data={'report': 'item_demand'})
+    assert rv.status_code == 503 and rv.headers['Retry-After'] == '5'
+    page = client.get('/dashboard').get_data(as_text=True)
+    assert 'Retry-After' in page and 'window.location = link.href' not in page
+    # Direct report URLs never render in-request on a miss either
+    for url in ('/export_confirmed_pdf', '/reports/item_demand.pdf'):
+        rv = client.get(url)
+        assert rv.status_code == 503 and rv.headers['Retry-After'] == '5'
+    monkeypatch.undo()
+    rv = client.get('/reports/item_demand.pdf')
+    assert rv.status_code == 202 and rv.get_json()['status_url'].startswith('/jobs/')
+    # Let the queued render finish before the fixture removes its directory
+    assert _get_report(client, '/reports/item_demand.pdf').status_code == 200
+
+
+def test_streaming_export_paginates_every_row():
+    from io import BytesIO
+    from reports import render_confirmed_orders_pdf
+    rows = ((f'Customer {i}', '5550000000', '🐄 Cow/Beef: 20 lb, 🐐 Goat: 5 lb', 170.0, 10.0)
+            for i in range(150))
+    out = BytesIO()
+    render_confirmed_orders_pdf(rows, out)
+    pdf = out.getvalue()
+    assert pdf.startswith(b'%PDF')
+    assert pdf.count(b'/Type /Page\n') > 3
+
+
+# ── Price cache ───────────────────────────────────────────────────────────────
+
+def test_price_cache_hits_until_prices_updated(client):
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+
+    client.get('/')
+    client.get('/')
+    stats = client.get('/cache_stats').get_json()['prices']
+    assert stats['misses'] >= 1
+    assert stats['hits'] >= 1
+    version_before = stats['version']
+
+    client.post('/update_prices', data={'cow_beef': '7.25'})
+    rv = client.get('/')
+    assert b'data-price="7.25"' in rv.data
+    assert client.get('/cache_stats').get_json()['prices']['version'] == version_before + 1
+
+
+def test_price_update_from_another_worker_applies_on_next_request(client):
+    from app import _bump_version
+    assert b'data-price="7.25"' not in client.get('/').data  # warms settings and price caches
+    with flask_app.app_context():
+        # What /update_prices does on another worker: this worker's caches are not invalidated
+        ItemPrice.query.filter_by(key='cow_beef').one().price = 7.25
+        _bump_version('prices_version')
+        db.session.commit()
+    assert b'data-price="7.25"' in client.get('/').data
+
+
+def test_cache_stats_requires_admin(client):
+    rv = client.get('/cache_stats')
+    assert rv.status_code == 403
+
+
+# ── Settings cache ────────────────────────────────────────────────────────────
+
+def test_toggle_orders_closes_form_immediately(client):
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    client.post('/toggle_orders')
+    rv = _submit_order(client, phone='5550030001')
+    assert rv.status_code == 403
+    assert b'closed' in client.get('/').data
+
+
+def test_closed_form_rejects_without_db_queries(client, queries):
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    client.post('/toggle_orders')
+    client.get('/')  # warm the settings cache
+
+    rv = _submit_order(client, phone='5550030002')
+    assert rv.status_code == 403
+    assert queries.counts('submit_order') == [0]
+
+
+# ── Query counts ──────────────────────────────────────────────────────────────
+
+def _seed_orders(n, status='Pending'):
+    """Insert n users with one regular order each, bypassing the rate-limited form."""
+    users = [User(zelle_name=f'Seed {i}', phone=f'555{i:07d}') for i in range(n)]
+    db.session.add_all(users)
+    db.session.flush()
+    db.session.add_all(
+        Order(user_id=user.id, items_ordered='🐄 Cow/Beef: 1 lb', total_price_usd=6.0, status=status,
+              amount_paid=1.0, items=[OrderItem(item_key='cow_beef', quantity=1, unit_price=6.0)])
+        for user in users
+    )
+    db.session.commit()
+
+
+def _clear_orders():
+    OrderItem.query.delete()
+    Order.query.delete()
+    User.query.delete()
+    db.session.commit()
+
+
+class QueryLog:
+    """Records the SQL statements each request sends through db.engine, per endpoint.
+
+    Use as a context manager (or the `queries` fixture / `@query_budget` decorator);
+    statements issued outside a request, such as test setup, are not counted.
+    """
+
+    def __init__(self):
+        self.requests = []  # [(endpoint, [statements])], in request order
+        self._current = None
+
+    def _started(self, sender, **extra):
+        self._current = []
+
+    def _finished(self, sender, response, **extra):
+        if self._current is not None:
+            self.requests.append((request.endpoint, self._current))
+        self._current = None
+
+    def _statement(self, conn, cursor, statement, *args):
+        if self._current is not None:
+            self._current.append(statement)
+
+    def __enter__(self):
+        request_started.connect(self._started, flask_app)
+        request_finished.connect(self._finished, flask_app)
+        event.listen(db.engine, 'before_cursor_execute', self._statement)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, 'before_cursor_execute', self._statement)
+        request_started.disconnect(self._started, flask_app)
+        request_finished.disconnect(self._finished, flask_app)
+
+    def counts(self, endpoint):
+        """Statement count of each recorded request to `endpoint`."""
+        return [len(statements) for name, statements in self.requests if name == endpoint]
+
+    def clear(self):
+        self.requests = []
+
+    def assert_within(self, **budgets):
+        """Fail if any request to a budgeted endpoint issued more statements than its budget.
+
+        Every budgeted endpoint must have been requested at least once, so a renamed
+        endpoint or a test that stops hitting it can't pass vacuously.
+        """
+        seen = {endpoint for endpoint, _ in self.requests}
+        missing = sorted(set(budgets) - seen)
+        assert not missing, f"budgeted endpoints never requested: {', '.join(missing)}"
+        for endpoint, statements in self.requests:
+            budget = budgets.get(endpoint)
+            assert budget is None or len(statements) <= budget, (
+                f"{endpoint} issued {len(statements)} SQL statements (budget {budget}):\n"
+                + "\n".join(statements)
+            )
+
+
+@pytest.fixture
+def queries(client):
+    """Per-request SQL statements for the whole test (see QueryLog)."""
+    with flask_app.app_context(), QueryLog() as log:
+        yield log
+
+
+def query_budget(**budgets):
+    """Fail the decorated test if any request to endpoint=N issues more than N SQL statements."""
+    def decorate(test):
+        @functools.wraps(test)
+        def wrapper(*args, **kwargs):
+            with flask_app.app_context(), QueryLog() as log:
+                test(*args, **kwargs)
+            log.assert_within(**budgets)
+        return wrapper
+    return decorate
+
+
+def _count_queries(client, url, log):
+    log.clear()
+    assert client.get(url).status_code == 200
+    return len(log.requests[-1][1])
+
+
+@pytest.mark.parametrize('url', ['/dashboard', '/export_confirmed_pdf'])
+def test_query_count_flat_as_orders_grow(client, queries, url):
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    with flask_app.app_context():
+        _seed_orders(3, status='Confirmed')
+        _get_report(client, url)  # warm per-worker caches (and render the PDF)
+        small = _count_queries(client, url, queries)
+        _clear_orders()
+        _seed_orders(40, status='Confirmed')
+        _get_report(client, url)
+        large = _count_queries(client, url, queries)
+    assert large == small
+
+
+# Per-request statement budgets; cold caches included. Raise them deliberately, never to fit a regression
+@query_budget(dashboard=7, api_orders=3)
+@pytest.mark.parametrize('n', [10, 1000])
+def test_admin_reads_stay_within_query_budget(client, n):
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    with flask_app.app_context():
+        _seed_orders(n)
+    for url in ('/dashboard', '/dashboard?status=Pending&item=cow_beef', '/api/orders'):
+        assert client.get(url).status_code == 200
+
+
+@query_budget(index=3, submit_order=9)
+def test_order_form_stays_within_query_budget(client):
+    assert client.get('/').status_code == 200
+    assert _submit_order(client, phone='5550250001').status_code == 200
+    assert _submit_order(client, phone='5550250001', qty=3).status_code == 200
+
+
+def test_query_budget_reports_the_statements(client, queries):
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    client.get('/dashboard')
+    with pytest.raises(AssertionError, match=r'dashboard issued \d+ SQL statements \(budget 1\)') as excinfo:
+        queries.assert_within(dashboard=1)
+    assert 'FROM "order"' in str(excinfo.value)
+    with pytest.raises(AssertionError, match='budgeted endpoints never requested: api_orders'):
+        queries.assert_within(dashboard=100, api_orders=100)
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+def test_metrics_record_latency_sql_and_spans(client):
+    assert client.get('/metrics').status_code == 403
+    _submit_order(client, phone='5550210001')
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    client.get('/dashboard')
+    rv = client.get('/metrics')
+    assert rv.status_code == 200
+    body = rv.get_data(as_text=True)
+    assert 'http_requests_total{endpoint="submit_order",method="POST",status="200"}' in body
+    assert 'http_request_duration_seconds_bucket{endpoint="dashboard",method="GET",le="+Inf"}' in body
+    assert 'db_statements_total{endpoint="dashboard"}' in body
+    assert 'span_duration_seconds_count{span="pin",endpoint="submit_order"}' in body
+    assert 'span_duration_seconds_count{span="render:dashboard.html",endpoint="dashboard"}' in body
+
+
+def test_admin_can_profile_a_request(client, tmp_path, monkeypatch):
+    from app import profiler
+    monkeypatch.setattr(profiler, 'profile_dir', str(tmp_path))
+    monkeypatch.setattr(profiler, 'keep', 2)
+    assert 'X-Profile-Id' not in client.get('/?_profile=1').headers  # not admin: ignored
+    assert client.get('/admin/profiles').status_code == 403
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    names = [client.get('/dashboard', headers={'X-Profile': '1'}).headers['X-Profile-Id'] for _ in range(3)]
+    assert names[-1].endswith('-dashboard')
+    assert sorted(os.listdir(tmp_path)) == sorted(f'{n}{ext}' for n in names[1:] for ext in ('.prof', '.json'))
+
+    page = client.get('/admin/profiles').get_data(as_text=True)
+    assert 'GET /dashboard' in page and 'app.py:' in page and '(dashboard)' in page
+    rv = client.get(f'/admin/profiles/{names[-1]}.prof')
+    assert rv.status_code == 200 and rv.data
+    assert client.get('/admin/profiles/..%2Fsecret.prof').status_code == 404
+
+    # One profile per process at a time: a request asking meanwhile runs unprofiled
+    held = profiler.start()
+    try:
+        assert 'X-Profile-Id' not in client.get('/dashboard?_profile=1').headers
+    finally:
+        profiler.discard(held)
+    assert 'X-Profile-Id' in client.get('/dashboard?_profile=1').headers
+
+
+# ── Dashboard pagination & filters ────────────────────────────────────────────
+
+def test_dashboard_keyset_pagination(client, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, 'DASHBOARD_PAGE_SIZE', 2)
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    with flask_app.app_context():
+        _seed_orders(5)
+        ids = [o.id for o in Order.query.order_by(Order.id)]
+
+    first = client.get('/dashboard').data
+    assert f'/edit_order/{ids[1]}"'.encode() in first
+    assert f'/edit_order/{ids[2]}"'.encode() not in first
+    assert f'after={ids[1]}'.encode() in first
+
+    second = client.get(f'/dashboard?after={ids[1]}').data
+    assert f'/edit_order/{ids[2]}"'.encode() in second
+    assert f'before={ids[2]}'.encode() in second
+
+    back = client.get(f'/dashboard?before={ids[2]}').data
+    assert f'/edit_order/{ids[0]}"'.encode() in back
+    assert b'Previous' not in back
+
+
+def test_dashboard_filters_keep_window_totals(client):
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    with flask_app.app_context():
+        _seed_orders(3)
+        paid = Order.query.order_by(Order.id).first()
+        paid.status = 'Confirmed'
+        paid.amount_paid = paid.total_price_usd
+        db.session.commit()
+        paid_id = paid.id
+
+    rv = client.get('/dashboard?status=Confirmed&balance=paid')
+    assert b'1 matching order' in rv.data
+    assert f'/edit_order/{paid_id}"'.encode() in rv.data
+    # Total received still covers all three orders: 6.00 + 1.00 + 1.00
+    assert b'Total Amount Received: $8.00' in rv.data
+
+    rv = client.get('/dashboard?balance=unpaid&item=cow_beef')
+    assert b'2 matching orders' in rv.data
+    assert f'/edit_order/{paid_id}"'.encode() not in rv.data
+
+
+# ── Orders API ────────────────────────────────────────────────────────────────
+
+def test_api_orders_masks_for_public_and_answers_304(client):
+    _submit_order(client, phone='5550050001', qty=2)
+    rv = client.get('/api/orders')
+    assert rv.status_code == 200
+    [order] = rv.json['orders']
+    assert (order['name'], order['phone']) == ('****', '******0001')
+    assert order['revision'] == rv.json['revision'] > 0
+
+    etag = rv.headers['ETag']
+    assert client.get('/api/orders', headers={'If-None-Match': etag}).status_code == 304
+
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    rv = client.get('/api/orders', headers={'If-None-Match': etag})
+    assert rv.status_code == 200
+    assert rv.json['orders'][0]['phone'] == '5550050001'
+
+
+def test_api_orders_since_returns_changes_and_deletions(client):
+    with flask_app.app_context():
+        _seed_orders(3)
+        ids = [o.id for o in Order.query.order_by(Order.id)]
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    revision = client.get('/api/orders').json['revision']
+    assert client.get('/api/orders?since=x').status_code == 400
+
+    client.post(f'/confirm_order/{ids[0]}')
+    client.post(f'/update_payment/{ids[1]}', data={'amount_paid': '3'})
+    assert client.post(f'/delete_order/{ids[2]}').status_code == 302
+    rv = client.get(f'/api/orders?since={revision}')
+    assert [(o['id'], o['status'], o['amount_paid']) for o in rv.json['orders']] == [
+        (ids[0], 'Confirmed', 1.0), (ids[1], 'Pending', 3.0),
+    ]
+    assert rv.json['deleted'] == [ids[2]]
+    assert rv.json['revision'] == revision + 3
+    assert client.get(f"/api/orders?since={rv.json['revision']}").json['orders'] == []
+
+
+def test_old_tombstones_are_pruned_and_stale_since_gets_full_snapshot(client, monkeypatch):
+    import app as app_module
+    from app import OrderTombstone
+    with flask_app.app_context():
+        _seed_orders(3)
+        ids = [o.id for o in Order.query.order_by(Order.id)]
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    revision = client.get('/api/orders').json['revision']
+    client.post(f'/delete_order/{ids[0]}')
+    with flask_app.app_context():
+        [(stamped,)] = db.session.query(OrderTombstone.revision).all()
+    assert stamped == revision + 1
+
+    monkeypatch.setattr(app_module, 'TOMBSTONE_TTL', -1)
+    client.post(f'/delete_order/{ids[1]}')
+    with flask_app.app_context():
+        assert OrderTombstone.query.count() == 0
+    rv = client.get(f'/api/orders?since={revision}')
+    assert rv.json['since'] is None
+    assert [o['id'] for o in rv.json['orders']] == [ids[2]]
+    assert client.get(f'/api/orders?since={revision + 2}').json['since'] == revision + 2
+
+
+# ── Live dashboard feed ───────────────────────────────────────────────────────
+
+def test_revision_bus_fans_out_changes_and_caps_clients():
+    from live_feed import RevisionBus, TooManySubscribers
+    state = {'revision': 5}
+    bus = RevisionBus(lambda: state['revision'], lambda since: {'revision': state['revision'], 'since': since},
+                      interval=0.01, max_subscribers=2)
+    first, second = bus.subscribe(), bus.subscribe(since=3)
+    with pytest.raises(TooManySubscribers):
+        bus.subscribe()
+    # The late joiner's cursor makes the next poll report from revision 3
+    assert first.get(timeout=2) == {'revision': 5, 'since': 3}
+    assert second.get(timeout=2) == {'revision': 5, 'since': 3}
+    state['revision'] = 6
+    assert first.get(timeout=2) == {'revision': 6, 'since': 5}
+    bus.unsubscribe(first)
+    bus.unsubscribe(second)
+    assert bus.subscriber_count() == 0
+
+
+def test_dashboard_events_stream_order_changes(client):
+    from app import _get_version
+    with flask_app.app_context():
+        _seed_orders(1)
+        order_id = Order.query.one().id
+        revision = _get_version('orders_version')
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    client.post(f'/confirm_order/{order_id}')
+
+    flask_app.config['SSE_STREAM_SECONDS'] = 3
+    try:
+        rv = client.get(f'/dashboard/events?since={revision}', buffered=False)
+        assert rv.mimetype == 'text/event-stream'
+        received = ''
+        for chunk in rv.response:
+            received += chunk.decode() if isinstance(chunk, bytes) else chunk
+            if 'event: orders' in received:
+                break
+        rv.close()
+    finally:
+        flask_app.config['SSE_STREAM_SECONDS'] = 300
+    assert f'"changed": [{order_id}]' in received
+
+    row = client.get(f'/dashboard/row/{order_id}?next=/dashboard')
+    assert row.data.startswith(f'<tr id="order-{order_id}">'.encode())
+    assert b'Confirmed' in row.data
+    # The page's filters apply: a row that no longer matches them is gone from that page
+    assert client.get(f'/dashboard/row/{order_id}?status=Pending&next=/dashboard').status_code == 404
+    assert client.get(f'/dashboard/row/{order_id}?status=Confirmed&next=/dashboard').status_code == 200
+
+
+def test_dashboard_revision_is_read_before_rows(client, monkeypatch):
+    import re
+    import app as app_module
+    with flask_app.app_context():
+        _seed_orders(1)
+        order_id = Order.query.one().id
+        db.session.add(Config(key='orders_version', value=1.0))
+        db.session.commit()
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+
+    filtered_orders = app_module._filtered_orders
+    def commit_from_another_worker(*args):
+        # Lands between the page's revision read and its rows query
+        with db.engine.begin() as conn:
+            revision = conn.execute(
+                db.update(Config).where(Config.key == 'orders_version')
+                .values(value=Config.value + 1).returning(Config.value)
+            ).scalar()
+            conn.execute(db.update(Order).where(Order.id == order_id)
+                         .values(status='Confirmed', revision=int(revision)))
+        return filtered_orders(*args)
+    monkeypatch.setattr(app_module, '_filtered_orders', commit_from_another_worker)
+    page = client.get('/dashboard').data.decode()
+    monkeypatch.setattr(app_module, '_filtered_orders', filtered_orders)
+    since = re.search(r'/dashboard/events\?since=(\d+)', page).group(1)
+
+    flask_app.config['SSE_STREAM_SECONDS'] = 3
+    try:
+        rv = client.get(f'/dashboard/events?since={since}', buffered=False)
+        received = ''
+        for chunk in rv.response:
+            received += chunk.decode() if isinstance(chunk, bytes) else chunk
+            if 'event: ' in received:
+                break
+        rv.close()
+    finally:
+        flask_app.config['SSE_STREAM_SECONDS'] = 300
+    assert f'"changed": [{order_id}]' in received
+
+
+def test_dashboard_events_reload_when_shared_cost_per_order_changes(client):
+    from app import _get_version
+    with flask_app.app_context():
+        _seed_orders(2)
+        revision = _get_version('orders_version')
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    client.post('/dashboard', data={'shared_cost': '10'})
+    # A third order moves every row's share of the $10 from $5.00 to $3.33
+    _submit_order(client, phone='5550060009')
+
+    flask_app.config['SSE_STREAM_SECONDS'] = 3
+    try:
+        rv = client.get(f'/dashboard/events?since={revision}&shared=5.00', buffered=False)
+        received = ''
+        for chunk in rv.response:
+            received += chunk.decode() if isinstance(chunk, bytes) else chunk
+            if 'event: ' in received:
+                break
+        rv.close()
+    finally:
+        flask_app.config['SSE_STREAM_SECONDS'] = 300
+    assert 'event: reload' in received
+    assert '"shared_per_order": 3.33' in received
+
+
+def test_live_feed_requires_admin(client):
+    assert client.get('/dashboard/events').status_code == 403
+    assert client.get('/dashboard/row/1').status_code == 403
+
+
+# ── Bulk admin actions ────────────────────────────────────────────────────────
+
+def test_bulk_confirm_updates_selection_in_one_request(client):
+    with flask_app.app_context():
+        _seed_orders(3)
+        ids = [o.id for o in Order.query.order_by(Order.id)]
+        Order.query.filter_by(id=ids[0]).update({'status': 'Confirmed'})
+        db.session.commit()
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    rv = client.post('/bulk/orders?next=/dashboard?status=Pending', data={
+        'action': 'confirm', 'order_ids': [str(i) for i in ids] + ['99999'],
+    })
+    assert rv.status_code == 200
+    assert b'2 changed, 1 unchanged, 1 skipped' in rv.data
+    assert b'Order #99999 not found' in rv.data
+    assert b'href="/dashboard?status=Pending"' in rv.data
+    with flask_app.app_context():
+        assert Order.query.filter_by(status='Confirmed').count() == 3
+
+    rv = client.post('/bulk/orders', data={'action': 'delete', 'order_ids': [str(ids[0]), str(ids[1])]})
+    assert b'2 changed' in rv.data
+    with flask_app.app_context():
+        assert Order.query.count() == 1
+        assert OrderItem.query.count() == 1
+
+
+def test_bulk_payments_from_pasted_grid(client):
+    with flask_app.app_context():
+        _seed_orders(3)
+        ids = [o.id for o in Order.query.order_by(Order.id)]
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    grid = f"#{ids[0]}, 12.50\n(555) 000-0001\t$1,006.00\n{ids[2]}, 1.00\nnonsense\n5559999999, 5\n"
+    rv = client.post('/bulk/payments', data={'payments': grid})
+    assert rv.status_code == 200
+    assert b'2 changed, 1 unchanged, 2 skipped' in rv.data
+    assert b'no order for phone 5559999999' in rv.data
+    with flask_app.app_context():
+        paid = dict(db.session.query(Order.id, Order.amount_paid))
+        assert paid == {ids[0]: 12.5, ids[1]: 1006.0, ids[2]: 1.0}
+
+
+def test_bulk_actions_require_admin(client):
+    assert client.post('/bulk/orders', data={'action': 'confirm', 'order_ids': ['1']}).status_code == 403
+    assert client.post('/bulk/payments', data={'payments': '1, 5'}).status_code == 403
+
+
+# ── Order line items ──────────────────────────────────────────────────────────
+
+def test_submit_writes_line_items(client):
+    client.post('/submit_order', data={
+        'zelle_name': 'Lines', 'phone': '5550040001', 'pin': '1234',
+        'cow_beef': '20', 'eggs': '2',
+    })
+    client.post('/submit_order', data={
+        'zelle_name': 'Lines', 'phone': '5550040001', 'pin': '1234',
+        'goat': '5',
+    })
+    with flask_app.app_context():
+        order = Order.query.join(User).filter(User.phone == '5550040001').one()
+        assert [(i.item_key, i.quantity, i.unit_price) for i in order.items] == [('goat', 5.0, PRICES['goat'])]
+        assert OrderItem.query.count() == 1
+
+
+def test_submit_upserts_one_order_per_customer(client):
+    from sqlalchemy.exc import IntegrityError
+    from app import _upsert_regular_order
+    _submit_order(client, phone='5550040002', qty=1)
+    _submit_order(client, phone='5550040002', qty=3)
+    with flask_app.app_context():
+        user = User.query.filter_by(phone='5550040002').one()
+        order = Order.query.filter_by(user_id=user.id).one()
+        assert order.total_price_usd == 3 * PRICES['cow_beef']
+        # A racing duplicate insert lands on the same row...
+        assert _upsert_regular_order(user.id, 'x', 1.0, '{}', []) == order.id
+        db.session.commit()
+        # ...and the unique index rejects a second regular order outright
+        db.session.add(Order(user_id=user.id, items_ordered='x', total_price_usd=1.0))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+
+def test_submit_fills_missing_pin_hash_in_one_commit(client):
+    with flask_app.app_context():
+        db.session.add(User(zelle_name='Legacy', phone='5550040003'))
+        db.session.commit()
+    commits = []
+    from sqlalchemy import event
+    listener = lambda conn: commits.append(1)
+    with flask_app.app_context():
+        event.listen(db.engine, 'commit', listener)
+        try:
+            rv = _submit_order(client, phone='5550040003', pin='2468')
+        finally:
+            event.remove(db.engine, 'commit', listener)
+    assert rv.status_code == 200
+    assert len(commits) == 1
+    assert _submit_order(client, phone='5550040003', pin='1111').status_code == 403
+
+
+def test_journal_intake_confirms_then_applies_in_batches(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(intake_journal, 'path', str(tmp_path / 'intake.db'))
+    monkeypatch.setattr(intake_journal, '_started_pid', None)
+    monkeypatch.setattr(intake_journal, '_committer', lambda: None)  # apply explicitly below
+    flask_app.config['INTAKE_MODE'] = 'journal'
+    try:
+        rv = _submit_order(client, phone='5550040004', pin='1357', qty=1)
+        assert rv.status_code == 200
+        assert b'Confirmation reference: <strong>#1' in rv.data
+        # Follow-up edit before the entry is applied must verify against the journaled PIN
+        assert _submit_order(client, phone='5550040004', pin='0000').status_code == 403
+        assert _submit_order(client, phone='5550040004', pin='1357', qty=6).status_code == 200
+        intake_journal.apply_pending()
+        assert intake_journal.stats() == {'pending': 0, 'applied': 2, 'rejected': 0}
+        with flask_app.app_context():
+            order = Order.query.join(User).filter(User.phone == '5550040004').one()
+            assert order.total_price_usd == 6 * PRICES['cow_beef']
+            assert [(i.item_key, i.quantity) for i in order.items] == [('cow_beef', 6.0)]
+    finally:
+        flask_app.config['INTAKE_MODE'] = 'direct'
+
+
+def test_journal_rejects_bad_entry_without_blocking_the_rest(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(intake_journal, 'path', str(tmp_path / 'intake.db'))
+    monkeypatch.setattr(intake_journal, '_started_pid', None)
+    monkeypatch.setattr(intake_journal, '_committer', lambda: None)
+    flask_app.config['INTAKE_MODE'] = 'journal'
+    try:
+        # An invalid post is refused before it reaches the journal
+        assert client.post('/submit_order', data={
+            'phone': '5550130001', 'pin': '1234', 'cow_beef': '1'}).status_code == 400
+        assert intake_journal.stats()['pending'] == 0
+
+        # An entry that can't be applied anyway is rejected alone; the one behind it lands
+        intake_journal.append('5550130002', {'zelle_name': None, 'phone': '5550130002'})
+        assert _submit_order(client, phone='5550130003').status_code == 200
+        with client.session_transaction() as sess:
+            sess['admin'] = True
+        take_lease, lease_free = intake_journal._take_lease, [False]  # another worker is applying
+        monkeypatch.setattr(intake_journal, '_take_lease', lambda conn: lease_free[0] and take_lease(conn))
+        rv = client.post('/clear_orders')
+        assert rv.status_code == 409 and rv.headers['Retry-After']
+        lease_free[0] = True
+        intake_journal.apply_pending()
+        assert intake_journal.stats() == {'pending': 0, 'applied': 1, 'rejected': 1}
+        # Applied entries are deleted once their batch commits; only the rejected one stays
+        assert intake_journal._conn().execute('SELECT COUNT(*) FROM entry').fetchone()[0] == 1
+        with flask_app.app_context():
+            assert Order.query.join(User).filter(User.phone == '5550130003').count() == 1
+    finally:
+        flask_app.config['INTAKE_MODE'] = 'direct'
+
+
+def test_dedupe_merges_payments_and_status_into_survivor(client, caplog):
+    from app import dedupe_orders
+    with flask_app.app_context():
+        db.session.execute(db.text('DROP INDEX uq_order_user_source'))  # as on a pre-index database
+        user = User(zelle_name='Dup', phone='5550120001')
+        db.session.add(user)
+        db.session.flush()
+        rows = [Order(user_id=user.id, items_ordered='🐄 Cow/Beef: 1 lb', total_price_usd=6.0,
+                      status=status, amount_paid=paid, source='regular')
+                for status, paid in [('Pending', 0.0), ('Confirmed', 6.0), ('Pending', 2.0)]]
+        db.session.add_all(rows)
+        db.session.commit()
+        first, confirmed, partial = (row.id for row in rows)
+
+        assert sorted(dedupe_orders()) == [first, partial]
+        survivor = db.session.execute(
+            db.select(Order.id, Order.status, Order.amount_paid).where(Order.user_id == user.id)
+        ).one()
+        assert tuple(survivor) == (confirmed, 'Confirmed', 8.0)
+    assert f'removed order {partial}' in caplog.text and f'merged into order {confirmed}' in caplog.text
+
+
+def test_edit_order_reads_and_writes_line_items(client):
+    client.post('/submit_order', data={
+        'zelle_name': 'Edit', 'phone': '5550040002', 'pin': '1234', 'cow_beef': '20',
+    })
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    with flask_app.app_context():
+        order_id = Order.query.join(User).filter(User.phone == '5550040002').one().id
+
+    rv = client.get(f'/edit_order/{order_id}')
+    assert b'name="cow_beef" id="cow_beef"\n               value="20"' in rv.data
+
+    client.post(f'/edit_order/{order_id}', data={'cow_beef': '10', 'duck': '1'})
+    with flask_app.app_context():
+        items = {i.item_key: i.quantity for i in db.session.get(Order, order_id).items}
+    assert items == {'cow_beef': 10.0, 'duck': 1.0}
+
+
+def test_backfill_order_items_parses_legacy_strings(client):
+    from app import backfill_order_items
+    with flask_app.app_context():
+        user = User(zelle_name='Legacy', phone='5550040003')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Order(user_id=user.id, total_price_usd=140.0,
+                             items_ordered='🐄 Cow/Beef: 20 lb, 🍳 Chicken Eggs: 4 dozen',
+                             price_snapshot='{"cow_beef": 6.0, "eggs": 5.0}'))
+        # Resolves to no line items; it must not be rescanned on every later run
+        db.session.add(Order(user_id=user.id, source='extra', total_price_usd=0.0,
+                             items_ordered='Something off the menu'))
+        db.session.commit()
+        assert backfill_order_items() == 2
+        statements = []
+        listen = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listen)
+        try:
+            assert backfill_order_items() == 0
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listen)
+        [scan] = [sql for sql in statements if 'FROM "order"' in sql]
+        items = {i.item_key: (i.quantity, i.unit_price) for i in OrderItem.query.all()}
+    assert items == {'cow_beef': (20.0, 6.0), 'eggs': (4.0, 5.0)}
+
+
+# ── Migrations ────────────────────────────────────────────────────────────────
+
+def test_migrations_apply_once_in_order(client):
+    from migrations import migrate, MIGRATIONS
+    with flask_app.app_context():
+        assert [version for version, _ in migrate()] == [version for version, _, _ in MIGRATIONS]
+        assert migrate() == []
+        indexes = {index['name'] for index in db.inspect(db.engine).get_indexes('order')}
+        assert {'ix_order_status', 'ix_order_source_status_id', 'uq_order_user_source'} <= indexes
+
+
+# ── Startup ───────────────────────────────────────────────────────────────────
+
+def test_importing_app_runs_no_ddl_and_defers_reportlab(tmp_path):
+    import subprocess
+    import sys
+    db_path = tmp_path / 'boot.db'
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}')
+    check = "import sys, app; assert 'reportlab' not in sys.modules; assert app._admin_password_hash is None"
+    subprocess.run([sys.executable, '-c', check], env=env, check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert not db_path.exists() or db_path.stat().st_size == 0
+
+
+# ── Item demand report ────────────────────────────────────────────────────────
+
+def test_item_demand_json_aggregates_line_items(client):
+    client.post('/submit_order', data={
+        'zelle_name': 'A', 'phone': '5550050001', 'pin': '1234', 'cow_beef': '20', 'eggs': '2',
+    })
+    client.post('/submit_order', data={
+        'zelle_name': 'B', 'phone': '5550050002', 'pin': '1234', 'cow_beef': '10',
+    })
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+
+    demand = client.get('/reports/item_demand.json').get_json()
+    assert demand['num_orders'] == 2
+    items = {item['key']: item for item in demand['items']}
+    assert items['cow_beef']['quantity'] == 30
+    assert items['cow_beef']['subtotal'] == 30 * PRICES['cow_beef']
+    assert items['eggs']['unit'] == 'dozen'
+    assert demand['grand_total'] == 30 * PRICES['cow_beef'] + 2 * PRICES['eggs']
+
+    # Cached until an order changes
+    assert client.get('/reports/item_demand.json').get_json() == demand
+    with flask_app.app_context():
+        order_id = Order.query.join(User).filter(User.phone == '5550050002').one().id
+    client.post(f'/delete_order/{order_id}')
+    demand = client.get('/reports/item_demand.json').get_json()
+    assert demand['num_orders'] == 1
+    assert {item['key']: item['quantity'] for item in demand['items']} == {'cow_beef': 20, 'eggs': 2}
+
+
+def test_report_snapshot_feeds_every_report(client):
+    from io import BytesIO
+    from app import build_report_snapshot
+    from reports import render_fcfs_pdf, render_dashboard_snapshot_pdf, render_item_demand_pdf
+    client.post('/submit_order', data={
+        'zelle_name': 'Ann & Bob', 'phone': '5550050004', 'pin': '1234', 'goat': '10', 'rooster': '2',
+    })
+    with flask_app.app_context():
+        snapshot = build_report_snapshot()
+    rank, _, name, phone, items, total, paid, status = snapshot['orders'][0]
+    assert (rank, name, phone, status) == (1, 'Ann & Bob', '555-005-0004', 'Pending')
+    assert items == 'Goat 10 lb, Rooster (4–5 lbs) ×2'
+    for render, data in ((render_fcfs_pdf, snapshot), (render_dashboard_snapshot_pdf, snapshot),
+                         (render_item_demand_pdf, snapshot['demand'])):
+        out = BytesIO()
+        render(data, out)
+        assert out.getvalue().startswith(b'%PDF')
+
+
+def test_window_reports_paginate_every_row():
+    from io import BytesIO
+    from reports import render_fcfs_pdf, render_dashboard_snapshot_pdf
+    orders = [(i + 1, i + 1, f'Customer {i}', '555-000-0000', 'Goat 10 lb, Cow/Beef 20 lb', 170.0, 100.0,
+               'Confirmed') for i in range(300)]
+    snapshot = {'orders': orders, 'generated': 'now', 'orders_open': False, 'shared_cost': 50.0}
+    for render in (render_fcfs_pdf, render_dashboard_snapshot_pdf):
+        out = BytesIO()
+        render(snapshot, out)
+        assert out.getvalue().count(b'/Type /Page\n') > 10
+
+
+def test_item_demand_pdf(client):
+    _submit_order(client, phone='5550050003')
+    with client.session_transaction() as sess:
+        sess['admin'] = True
+    rv = _get_report(client, '/reports/item_demand.pdf')
+    assert rv.status_code == 200
+    assert rv.data.startswith(b'%PDF')